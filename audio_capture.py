@@ -0,0 +1,252 @@
+import time
+import threading
+import numpy as np
+import sounddevice as sd
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+
+
+class VoiceActivityDetector:
+    """
+    Frame level voice activity detection
+    Compares each frame's RMS energy against an adaptive noise floor
+    """
+
+    def __init__(self, threshold=0.01, ratio=3.0, frame_ms=FRAME_MS, sample_rate=SAMPLE_RATE):
+        self.threshold = threshold
+        self.ratio = ratio
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.noise_floor = threshold / ratio
+
+    def reset(self):
+        self.noise_floor = self.threshold / self.ratio
+
+    def is_speech(self, frame):
+        rms = float(np.sqrt(np.mean(np.square(frame)))) if len(frame) else 0.0
+        speech = rms > max(self.threshold, self.noise_floor * self.ratio)
+
+        # only learn the floor from non-speech frames
+        if not speech:
+            self.noise_floor = 0.95 * self.noise_floor + 0.05 * rms
+        return speech
+
+
+class RingBuffer:
+    """
+    Fixed size float32 ring buffer addressed by absolute sample position
+    Position 0 is the first sample ever written
+    """
+
+    def __init__(self, capacity):
+        self.capacity = int(capacity)
+        self.data = np.zeros(self.capacity, dtype=np.float32)
+        self.total = 0
+
+    @property
+    def oldest(self):
+        return max(0, self.total - self.capacity)
+
+    def write(self, samples):
+        n = len(samples)
+        # only the newest `capacity` samples can survive anyway
+        samples = samples[-self.capacity:]
+        m = len(samples)
+
+        idx = (self.total + n - m) % self.capacity
+        first = min(m, self.capacity - idx)
+        self.data[idx:idx + first] = samples[:first]
+        self.data[:m - first] = samples[first:]
+        self.total += n
+
+    def read(self, start, end, out=None):
+        """Copy samples [start, end) into out (or a new array)"""
+        start = max(start, self.oldest)
+        end = min(end, self.total)
+        n = max(0, end - start)
+        if out is None:
+            out = np.empty(n, dtype=np.float32)
+        else:
+            out = out[:n]
+
+        idx = start % self.capacity
+        first = min(n, self.capacity - idx)
+        out[:first] = self.data[idx:idx + first]
+        out[first:] = self.data[:n - first]
+        return out
+
+
+class MicStream:
+    """
+    Always-open microphone input feeding a RingBuffer
+    Each turn slices audio out of the ring instead of reopening the device
+    """
+
+    def __init__(self, seconds=30, sample_rate=SAMPLE_RATE, frame_ms=FRAME_MS):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * frame_ms / 1000)
+        self.ring = RingBuffer(seconds * sample_rate)
+        self.cond = threading.Condition()
+        self.stream = None
+        # reused for every utterance so a turn doesn't allocate
+        self.scratch = np.zeros(self.ring.capacity, dtype=np.float32)
+        # optional EchoCanceller, the ring then only holds the user's side
+        self.echo = None
+
+    def start(self):
+        if self.stream is not None:
+            return
+        self.stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            blocksize=self.frame_len,
+            callback=self._callback
+        )
+        self.stream.start()
+
+    def close(self):
+        if self.stream is None:
+            return
+        try:
+            self.stream.close()
+        except Exception as e:
+            print(f"[Mic Error]: {e}")
+        self.stream = None
+
+    def _callback(self, indata, frame_count, time_info, status):
+        if status:
+            print(f"[Capture Warning]: {status}")
+        self._push(indata[:, 0])
+
+    def _push(self, frame):
+        if self.echo is not None:
+            frame = self.echo.process(frame, self.ring.total)
+        with self.cond:
+            self.ring.write(frame)
+            self.cond.notify_all()
+
+    @property
+    def position(self):
+        return self.ring.total
+
+    def ms_to_samples(self, ms):
+        return int(self.sample_rate * ms / 1000)
+
+    def wait_for(self, position, timeout=0.5):
+        """Block until the ring has reached position; False on timeout"""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.ring.total >= position, timeout)
+
+    def read(self, start, end, out=None):
+        with self.cond:
+            return self.ring.read(start, end, out)
+
+
+def capture_utterance(
+    mic,
+    vad=None,
+    since=None,
+    pre_roll_ms=300,
+    max_seconds=8.0,
+    hangover_ms=700,
+    start_timeout=5.0,
+    on_progress=None,
+    stop=None
+):
+    """
+    Slice one utterance out of an open MicStream
+    Scanning starts at `since` (default: now) so speech that began before
+    the call, e.g. during the beep, is not lost. Returns as soon as the
+    speaker has been quiet for hangover_ms, or an empty array if nobody
+    starts talking within start_timeout.
+    The result is a view into mic.scratch and is only valid until the
+    next capture.
+    on_progress(start, end) is called for every frame once speech has
+    started, and once more with the span that is returned; setting the
+    `stop` event ends the capture early.
+    """
+    vad = vad or VoiceActivityDetector(sample_rate=mic.sample_rate)
+    frame_len = vad.frame_len
+    frame = np.empty(frame_len, dtype=np.float32)
+
+    pre_roll = mic.ms_to_samples(pre_roll_ms)
+    hangover_frames = max(1, mic.ms_to_samples(hangover_ms) // frame_len)
+    max_samples = min(int(max_seconds * mic.sample_rate), mic.ring.capacity)
+
+    cursor = mic.position if since is None else max(since, mic.ring.oldest)
+    speech_start = None
+    silent_run = 0
+    deadline = time.monotonic() + start_timeout
+
+    while True:
+        if not mic.wait_for(cursor + frame_len):
+            # no frames arriving: before speech that's the start timeout, after
+            # it the mic has stalled (unplugged, PortAudio error), keep what we have
+            if time.monotonic() > deadline or (stop is not None and stop.is_set()):
+                if speech_start is not None:
+                    print("[Mic Error]: no audio from the microphone, ending the recording")
+                break
+            continue
+
+        mic.read(cursor, cursor + frame_len, out=frame)
+        cursor += frame_len
+        speech = vad.is_speech(frame)
+
+        if speech_start is None:
+            if speech:
+                speech_start = max(cursor - frame_len - pre_roll, mic.ring.oldest)
+                # wall-clock bound too, max_samples only counts frames that arrive
+                deadline = time.monotonic() + max_seconds + 1.0
+            elif time.monotonic() > deadline:
+                break
+            continue
+
+        silent_run = 0 if speech else silent_run + 1
+        if on_progress:
+            on_progress(speech_start, cursor)
+        if stop is not None and stop.is_set():
+            break
+        if silent_run >= hangover_frames or cursor - speech_start >= max_samples:
+            break
+
+    if speech_start is None:
+        return mic.scratch[:0]
+
+    # drop most of the trailing silence, keep a little tail for the decoder
+    tail = max(0, silent_run - hangover_frames // 4) * frame_len
+    end = min(cursor - tail, speech_start + max_samples)
+    if on_progress:
+        on_progress(speech_start, end)
+    return mic.read(speech_start, end, out=mic.scratch)
+
+
+def watch_for_speech(mic, done, vad, min_speech_ms=250):
+    """
+    Scan live mic frames until the `done` event is set
+    Returns the ring position where at least min_speech_ms of continuous
+    speech began, or None if done was set first. Used for barge-in while
+    the assistant is talking.
+    """
+    frame_len = vad.frame_len
+    frame = np.empty(frame_len, dtype=np.float32)
+    needed = max(1, mic.ms_to_samples(min_speech_ms) // frame_len)
+
+    cursor = mic.position
+    run_start = None
+    run = 0
+    while not done.is_set():
+        if not mic.wait_for(cursor + frame_len, timeout=0.1):
+            continue
+        mic.read(cursor, cursor + frame_len, out=frame)
+
+        if vad.is_speech(frame):
+            if run == 0:
+                run_start = cursor
+            run += 1
+            if run >= needed:
+                return run_start
+        else:
+            run = 0
+        cursor += frame_len
+    return None
@@ -0,0 +1,64 @@
+import io
+import threading
+import numpy as np
+import pygame
+
+
+def decode_to_pcm(data):
+    """
+    Decode encoded speech (mp3/wav bytes) into the mixer's own PCM format
+    int16, shape (frames, channels), ready for pygame.mixer.Sound(buffer=...)
+    """
+    sound = pygame.mixer.Sound(file=io.BytesIO(data))
+    channels = pygame.mixer.get_init()[2]
+    return np.frombuffer(sound.get_raw(), dtype=np.int16).reshape(-1, channels)
+
+
+def pcm_seconds(pcm):
+    return len(pcm) / pygame.mixer.get_init()[0]
+
+
+class Playback:
+    """
+    One clip playing from memory
+    `done` is set when the clip ends (a timer on its known length, no
+    polling) or as soon as stop() is called.
+    """
+
+    def __init__(self, pcm):
+        self.sound = pygame.mixer.Sound(buffer=np.ascontiguousarray(pcm))
+        self.done = threading.Event()
+        self.interrupted = False
+        self.channel = None
+        self.timer = None
+
+    def start(self):
+        self.channel = self.sound.play()
+        if self.channel is None:
+            # no free mixer channel
+            self.done.set()
+            return self
+
+        # small margin for the mixer's output buffer
+        self.timer = threading.Timer(self.sound.get_length() + 0.05, self.done.set)
+        self.timer.daemon = True
+        self.timer.start()
+        return self
+
+    def stop(self):
+        if self.done.is_set():
+            return
+        self.interrupted = True
+        if self.timer:
+            self.timer.cancel()
+        if self.channel:
+            self.channel.stop()
+        self.done.set()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+def play_pcm(pcm):
+    """Play decoded PCM and wait for it to finish"""
+    Playback(pcm).start().wait()
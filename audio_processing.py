@@ -0,0 +1,128 @@
+import wave
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+FRAME_LEN = SAMPLE_RATE * FRAME_MS // 1000
+
+
+def frame_rms(audio, frame_len=FRAME_LEN):
+    """RMS of every whole frame, one value per frame"""
+    n = len(audio) // frame_len
+    frames = audio[:n * frame_len].reshape(n, frame_len)
+    return np.sqrt(np.einsum("ij,ij->i", frames, frames) / frame_len)
+
+
+def voiced_span(rms, threshold, pad_frames=5):
+    """(first, last + 1) frame of audible audio with some padding, None if silent"""
+    loud = np.flatnonzero(rms > threshold)
+    if loud.size == 0:
+        return None
+    return max(0, loud[0] - pad_frames), min(len(rms), loud[-1] + 1 + pad_frames)
+
+
+def noise_gate(audio, rms, threshold, floor=0.1, frame_len=FRAME_LEN):
+    """
+    Attenuate frames below threshold to `floor`, in place
+    The open gate is widened by one frame each side so word edges survive
+    """
+    if rms.size == 0:
+        return audio
+    gains = np.where(rms > threshold, 1.0, floor).astype(np.float32)
+    gains[1:] = np.maximum(gains[1:], gains[:-1].copy())
+    gains[:-1] = np.maximum(gains[:-1], gains[1:].copy())
+
+    n = len(rms)
+    audio[:n * frame_len].reshape(n, frame_len)[:] *= gains[:, None]
+    audio[n * frame_len:] *= gains[-1]
+    return audio
+
+
+def auto_gain(audio, rms, threshold, target_rms=0.1, max_gain=10.0):
+    """Scale so speech frames average target_rms, without clipping the peak, in place"""
+    speech = rms[rms > threshold]
+    if speech.size == 0:
+        return audio
+
+    gain = target_rms / float(np.sqrt(np.mean(np.square(speech))))
+    peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+    if peak > 0:
+        gain = min(gain, 0.99 / peak)
+    gain = min(gain, max_gain)
+
+    audio *= gain
+    return np.clip(audio, -1.0, 1.0, out=audio)
+
+
+def condition(
+    audio,
+    min_rms=0.004,
+    gate_threshold=None,
+    target_rms=0.1,
+    max_gain=10.0,
+    frame_len=FRAME_LEN
+):
+    """
+    Get a raw mic buffer ready for STT
+    Trims leading/trailing silence, gates background noise and normalizes
+    level. Returns an empty array when nothing in the buffer is louder
+    than min_rms, so the caller can skip transcription entirely.
+    The noise gate defaults to 2 * min_rms, lowered for a quiet speaker
+    so their own words aren't gated out.
+    Works in place: the result is a view into `audio`.
+    """
+    rms = frame_rms(audio, frame_len)
+    peak = float(rms.max()) if rms.size else 0.0
+    if peak < min_rms:
+        return audio[:0]
+
+    if gate_threshold is None:
+        gate_threshold = 2 * min_rms
+    gate_threshold = min(gate_threshold, 0.5 * peak)
+
+    span = voiced_span(rms, min_rms)
+    if span is None:
+        return audio[:0]
+
+    first, last = span
+    end = len(audio) if last == len(rms) else last * frame_len
+    audio = audio[first * frame_len:end]
+    rms = rms[first:last]
+
+    noise_gate(audio, rms, gate_threshold, frame_len=frame_len)
+    return auto_gain(audio, rms, gate_threshold, target_rms, max_gain)
+
+
+def read_wav(path):
+    """16 kHz mono float32, whatever the file's format"""
+    with wave.open(path, "rb") as f:
+        channels = f.getnchannels()
+        width = f.getsampwidth()
+        rate = f.getframerate()
+        raw = f.readframes(f.getnframes())
+
+    if width == 1:
+        audio = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        audio = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768
+    elif width == 4:
+        audio = np.frombuffer(raw, dtype=np.int32).astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"{path}: unsupported sample width {width}")
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+
+    return resample(audio, rate)
+
+
+def resample(audio, rate, target=SAMPLE_RATE):
+    """Linear resampling to `target` Hz, float32"""
+    if rate != target:
+        n = int(len(audio) * target / rate)
+        audio = np.interp(
+            np.linspace(0, len(audio) - 1, n),
+            np.arange(len(audio)),
+            audio
+        )
+    return np.ascontiguousarray(audio, dtype=np.float32)
@@ -0,0 +1,182 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+import numpy as np
+import sounddevice as sd
+import pygame
+from audio_capture import SAMPLE_RATE, MicStream, capture_utterance
+from audio_output import Playback, decode_to_pcm
+from audio_processing import read_wav
+from echo_canceller import EchoCanceller
+
+
+def make_beep(sample_rate=16000, duration=0.1, freq=16000):
+    """The listening cue, computed once instead of on every beep()"""
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    return (np.sin(2 * np.pi * freq * t) * 0.3).astype(np.float32)
+
+
+class AudioSession:
+    """
+    Every audio device one assistant uses, opened once
+    - input: an always-open MicStream (None in fixed 8 second mode)
+    - output: the pygame mixer, clips play from memory as Playback objects
+    - cues: precomputed sounds like the listening beep
+    - echo: with echo_cancel, every clip played is subtracted from the mic
+      so it can keep listening while we talk
+    play() and record_async() don't block; swap in FileAudioSession to
+    run the assistant without a sound card.
+    """
+
+    def __init__(self, capture=True, mic=None, echo_cancel=False):
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+
+        self.cues = {"beep": (make_beep(), 16000)}
+        self.mic = mic
+        if self.mic is None and capture:
+            try:
+                self.mic = MicStream()
+                self.mic.start()
+            except Exception as e:
+                print(f"[Mic Error]: {e}")
+                self.mic = None
+
+        self.echo = None
+        if self.mic is not None and echo_cancel:
+            self.echo = EchoCanceller()
+            self.mic.echo = self.echo
+
+    # output
+
+    def decode(self, data):
+        return decode_to_pcm(data)
+
+    def play(self, pcm):
+        """Start a clip, returns its Playback (wait() on it or stop() it)"""
+        playback = Playback(pcm)
+        if self.echo is not None:
+            self.echo.set_reference(pcm, pygame.mixer.get_init()[0], self.mic.position, playback)
+        return playback.start()
+
+    def play_cue(self, name, wait=True):
+        tone, rate = self.cues[name]
+        sd.play(tone, rate)
+        if wait:
+            sd.wait()
+
+    # input
+
+    def record(self, **kwargs):
+        """One utterance from the open mic, see capture_utterance"""
+        return capture_utterance(self.mic, **kwargs)
+
+    def record_async(self, **kwargs):
+        """record() on a worker thread, returns a Future"""
+        future = Future()
+
+        def run():
+            try:
+                future.set_result(self.record(**kwargs))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, daemon=True).start()
+        return future
+
+    def record_fixed(self, seconds):
+        """The old fixed-length recording, for when there is no open mic"""
+        audio = sd.rec(
+            int(SAMPLE_RATE * seconds),
+            samplerate=SAMPLE_RATE,
+            channels=1,
+            dtype="float32"
+        )
+        sd.wait()
+        return np.squeeze(audio)
+
+    def close(self):
+        if self.mic:
+            self.mic.close()
+            self.mic = None
+
+
+class FileMicStream(MicStream):
+    """MicStream fed from queued audio at real-time pace instead of a device"""
+
+    def __init__(self, speed=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.speed = speed
+        self.pending = queue.Queue()
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def feed(self, audio):
+        self.pending.put(np.asarray(audio, dtype=np.float32))
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def close(self):
+        self.stopped.set()
+
+    def _run(self):
+        silence = np.zeros(self.frame_len, dtype=np.float32)
+        frame_seconds = self.frame_len / self.sample_rate / self.speed
+        audio = None
+        offset = 0
+
+        while not self.stopped.is_set():
+            if audio is None:
+                try:
+                    audio, offset = self.pending.get_nowait(), 0
+                except queue.Empty:
+                    pass
+
+            if audio is None:
+                frame = silence
+            else:
+                frame = audio[offset:offset + self.frame_len]
+                offset += self.frame_len
+                if offset >= len(audio):
+                    audio = None
+
+            self._push(frame)
+            time.sleep(frame_seconds)
+
+
+class FileAudioSession(AudioSession):
+    """
+    Headless AudioSession for tests and demos
+    The "mic" plays the given WAV files (or float32 arrays) one after
+    another with a gap of silence between them. Output goes to SDL's dummy
+    driver; every clip and cue is kept in self.played.
+    """
+
+    def __init__(self, inputs=(), speed=1.0, gap_seconds=1.0, echo_cancel=False):
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        self.played = []
+
+        mic = FileMicStream(speed=speed)
+        for item in inputs:
+            mic.feed(read_wav(item) if isinstance(item, str) else item)
+            mic.feed(np.zeros(int(gap_seconds * SAMPLE_RATE), dtype=np.float32))
+        mic.start()
+
+        super().__init__(mic=mic, echo_cancel=echo_cancel)
+
+    def play(self, pcm):
+        self.played.append(pcm)
+        return super().play(pcm)
+
+    def play_cue(self, name, wait=True):
+        self.played.append(name)
+
+    def record_fixed(self, seconds):
+        start = self.mic.position
+        self.mic.wait_for(start + int(seconds * SAMPLE_RATE), timeout=seconds / self.mic.speed + 1)
+        return self.mic.read(start, start + int(seconds * SAMPLE_RATE))
@@ -0,0 +1,192 @@
+"""
+Offline speech-to-text benchmark
+
+Replays a folder of recordings through the same conditioning and STT
+engines listen() uses, no microphone needed.
+
+Corpus layout:
+    corpus/en/call_mom.wav
+    corpus/en/call_mom.txt      reference transcript
+    corpus/hi/madad.wav
+    corpus/hi/madad.txt
+The folder name (en/hi) is the language passed to the engine; files in
+any other folder are decoded with language detection.
+
+Usage:
+    python benchmark_stt.py corpus --engines whisper,faster-whisper --sizes base,small
+"""
+import os
+import sys
+import json
+import time
+import resource
+import argparse
+import unicodedata
+import multiprocessing
+import numpy as np
+from audio_processing import condition, read_wav
+
+SAMPLE_RATE = 16000
+MIN_SPEECH_RMS = float(os.getenv("MIN_SPEECH_RMS", "0.004"))
+
+
+# corpus
+
+def load_corpus(root):
+    items = []
+    for folder, _, files in sorted(os.walk(root)):
+        language = os.path.basename(folder)
+        language = language if language in ("en", "hi") else None
+
+        for name in sorted(files):
+            if not name.lower().endswith(".wav"):
+                continue
+            path = os.path.join(folder, name)
+            ref_path = os.path.splitext(path)[0] + ".txt"
+            if not os.path.exists(ref_path):
+                print(f"Skipping {path}: no reference transcript")
+                continue
+            with open(ref_path, "r", encoding="utf-8") as f:
+                reference = f.read().strip()
+            items.append({"path": path, "language": language, "reference": reference})
+    return items
+
+
+# scoring
+
+def normalize(text):
+    """Lowercase, drop punctuation (any script), collapse spaces"""
+    text = "".join(
+        " " if unicodedata.category(ch).startswith("P") else ch
+        for ch in text.lower()
+    )
+    return text.split()
+
+
+def word_errors(reference, hypothesis):
+    """Word level edit distance between two transcripts"""
+    ref = normalize(reference)
+    hyp = normalize(hypothesis)
+
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(
+                row[j] + 1,
+                row[j - 1] + 1,
+                prev + (r != h)
+            )
+    return row[-1], len(ref)
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+# running
+
+def run_engine(name, size, items):
+    """Benchmark one engine/size; runs in its own process so peak RSS is its own"""
+    from stt_engines import ENGINES
+
+    engine = ENGINES[name](size)
+    engine.warm_up()
+
+    rows = []
+    for item in items:
+        audio = read_wav(item["path"])
+        duration = len(audio) / SAMPLE_RATE
+
+        # same path as BraillAI.listen(): condition, skip if silent, transcribe
+        started = time.perf_counter()
+        audio = condition(audio, min_rms=MIN_SPEECH_RMS)
+        if audio.size == 0:
+            text = ""
+        else:
+            text = engine.transcribe(audio, language=item["language"])["text"]
+        latency = time.perf_counter() - started
+
+        errors, words = word_errors(item["reference"], text)
+        rows.append({
+            "file": item["path"],
+            "language": item["language"] or "auto",
+            "audio": duration,
+            "latency": latency,
+            "rtf": latency / duration if duration else 0.0,
+            "errors": errors,
+            "words": words,
+            "hypothesis": text
+        })
+        print(f"  {os.path.basename(item['path'])}: {latency:.2f}s  {errors}/{words} errors  \"{text}\"")
+
+    return {
+        "engine": name,
+        "size": size,
+        "load": engine.load_seconds,
+        "peak_rss": peak_rss_mb(),
+        "rows": rows
+    }
+
+
+def summarize(run):
+    lines = []
+    by_language = {}
+    for row in run["rows"]:
+        by_language.setdefault(row["language"], []).append(row)
+
+    for language, rows in sorted(by_language.items()):
+        latencies = np.array([r["latency"] for r in rows])
+        errors = sum(r["errors"] for r in rows)
+        words = sum(r["words"] for r in rows)
+        lines.append(
+            f"{run['engine']:<16}{run['size']:<8}{language:<6}{len(rows):>5}"
+            f"{np.median(latencies):>10.2f}{np.percentile(latencies, 95):>10.2f}"
+            f"{np.mean([r['rtf'] for r in rows]):>8.2f}"
+            f"{100.0 * errors / max(words, 1):>8.1f}"
+            f"{run['load']:>8.1f}{run['peak_rss']:>10.0f}"
+        )
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Braill-AI speech to text offline")
+    parser.add_argument("corpus", help="folder of .wav files with .txt references")
+    parser.add_argument("--engines", default="whisper", help="comma separated, see stt_engines.ENGINES")
+    parser.add_argument("--sizes", default="base", help="comma separated model sizes")
+    parser.add_argument("--json", help="also write every measurement to this file")
+    args = parser.parse_args()
+
+    items = load_corpus(args.corpus)
+    if not items:
+        print(f"No .wav files with references under {args.corpus}")
+        sys.exit(1)
+    print(f"{len(items)} recordings")
+
+    runs = []
+    ctx = multiprocessing.get_context("spawn")
+    for name in args.engines.split(","):
+        for size in args.sizes.split(","):
+            print(f"\n{name} ({size})")
+            with ctx.Pool(1) as pool:
+                runs.append(pool.apply(run_engine, (name.strip(), size.strip(), items)))
+
+    print("\n" + "=" * 84)
+    print(
+        f"{'engine':<16}{'size':<8}{'lang':<6}{'files':>5}"
+        f"{'p50 s':>10}{'p95 s':>10}{'RTF':>8}{'WER %':>8}{'load s':>8}{'RSS MB':>10}"
+    )
+    print("=" * 84)
+    for run in runs:
+        for line in summarize(run):
+            print(line)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(runs, f, indent=2, ensure_ascii=False)
+        print(f"\nSaved {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,29 @@
 import os
+import re
 import json
 import time
 import threading
 import datetime
+from concurrent.futures import Future
 import numpy as np
-import sounddevice as sd
-import whisper
 import speech_recognition as sr
-from google import genai
-from gtts import gTTS
-import pygame
-import tempfile
-import pyttsx3
 from mobilerun import Mobilerun
+from audio_capture import VoiceActivityDetector, watch_for_speech
+from audio_processing import condition
+import model_registry
+from streaming_stt import StreamingTranscriber
+from tts_cache import TTSCache
+from tts_router import TTSRouter
+from audio_session import AudioSession
+from prompts import STATIC_PROMPTS
+from streaming_speaker import StreamingSpeaker, split_sentences, stream_sentences
+from intent_router import IntentRouter
+from intent_classifier import IntentClassifier
+from response_cache import ResponseCache
+from llm_client import make_client, ResilientLLM, DeadlineExceeded
+from speculation import Speculation
+from conversation_memory import ConversationMemory, is_follow_up
+import time_parser
 
 #API
 # Load environment variables
@@ -21,8 +32,44 @@ MOBILERUN_KEY = os.getenv("MOBILERUN_KEY", "")
 DEVICE_ID = os.getenv("DEVICE_ID", "")
 
 REMINDER_FILE = "reminders.json"
+# "remind me to take aspirin" -> "aspirin", applied after the time is cut out
+REMINDER_SUBJECT = re.compile(
+    r"(?:remind me (?:to take|to|about|of)|reminder (?:for|to take|to|about)|"
+    r"set (?:a )?reminder (?:for|to take|to))\s+(?:my\s+)?(.+)$"
+)
 NOTES_FILE = "notes.json"
 
+# Capture: "vad" stops when the user stops talking, "fixed" records 8 seconds
+CAPTURE_MODE = os.getenv("CAPTURE_MODE", "vad")
+VAD_PRE_ROLL_MS = int(os.getenv("VAD_PRE_ROLL_MS", "300"))
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "700"))
+MAX_UTTERANCE_SECONDS = float(os.getenv("MAX_UTTERANCE_SECONDS", "8"))
+
+# Barge-in: talking over the assistant stops it; stricter than normal VAD
+# so the assistant's own voice doesn't trigger it
+BARGE_IN = os.getenv("BARGE_IN", "1") == "1"
+BARGE_IN_THRESHOLD = float(os.getenv("BARGE_IN_THRESHOLD", "0.03"))
+BARGE_IN_MS = int(os.getenv("BARGE_IN_MS", "250"))
+# subtract our own voice from the mic (echo_canceller), see listen()
+ECHO_CANCEL = os.getenv("ECHO_CANCEL", "1") == "1"
+
+# Buffers quieter than this are never sent to STT
+MIN_SPEECH_RMS = float(os.getenv("MIN_SPEECH_RMS", "0.004"))
+
+# Partial transcripts while the user is still talking
+STREAMING_STT = os.getenv("STREAMING_STT", "1") == "1"
+PARTIAL_STEP_MS = int(os.getenv("PARTIAL_STEP_MS", "800"))
+# ask Gemini while the user is still finishing a question, see _on_partial
+SPECULATIVE_AI = os.getenv("SPECULATIVE_AI", "1") == "1"
+SPECULATE_MAX = int(os.getenv("SPECULATE_MAX", "2"))
+
+# Hindi runs locally; leave engine/size empty to reuse the English model
+HINDI_STT_ENGINE = os.getenv("HINDI_STT_ENGINE", "")
+HINDI_STT_MODEL_SIZE = os.getenv("HINDI_STT_MODEL_SIZE", "")
+# "google" retries weak local results with Google Web Speech (needs network)
+HINDI_STT_FALLBACK = os.getenv("HINDI_STT_FALLBACK", "")
+HINDI_MIN_CONFIDENCE = float(os.getenv("HINDI_MIN_CONFIDENCE", "0.4"))
+
 # Emergency contact
 EMERGENCY_CONTACT = {
     "name": "wife",
@@ -40,7 +87,16 @@ CONTACTS = {
 
 
 #Gemini
-genai_client = genai.Client(api_key=GEMINI_API_KEY)
+# AI_FAKE=1 swaps in an offline stand-in, see llm_client
+genai_client = make_client(GEMINI_API_KEY)
+# deadlines, retries and hedged requests; a slow Gemini call can't freeze run()
+llm = ResilientLLM(genai_client)
+
+AI_MODEL = "gemini-2.5-flash-lite"
+AI_PROMPTS = {
+    "hi": "बहुत छोटा उत्तर दें (1-2 वाक्य)। कोई काम करने के बारे में मत बताओ, सिर्फ जवाब दो। प्रश्न: {question}",
+    "en": "Give a very short answer (1-2 sentences). Don't describe actions or make up results. Just answer the question. Question: {question}",
+}
 
 # Load files
 if not os.path.exists(REMINDER_FILE):
@@ -53,10 +109,12 @@ if not os.path.exists(NOTES_FILE):
 
 
 class BraillAI:
-    def __init__(self):
+    def __init__(self, audio=None):
         """
         Initialize BraillAI
-        STT: Whisper for English, Google SR for Hindi
+        STT: configured engine (stt_engines) for English and Hindi,
+        Google SR only as an optional Hindi fallback
+        audio: an AudioSession, e.g. a FileAudioSession to run without a sound card
         """
         self.language = None
         self.running = True
@@ -66,74 +124,218 @@ class BraillAI:
         
         self.contacts = {}
 
-        self.whisper_model = whisper.load_model("base")
+        # Whisper and Mobilerun load in the background, see _load_resources
+        self.stt = None
+        self.stt_hi = None
+        self.stt_hi_lock = threading.Lock()
+        self.closed = False
+        self._phone = None
+        self.phone_ready = threading.Event()
+        self.ready = Future()
+        threading.Thread(target=self._load_resources, daemon=True).start()
         
         self.recognizer = sr.Recognizer()
         self.recognizer.energy_threshold = 300
         self.recognizer.dynamic_energy_threshold = True
+
+        self.vad = VoiceActivityDetector()
+        self.barge_in_vad = VoiceActivityDetector(threshold=BARGE_IN_THRESHOLD, ratio=4.0)
+        self.playback = None
+        # mic, mixer and cues open once for the whole session; the mixer is up
+        # before Whisper loads so the language prompt can play meanwhile.
+        # the always-open mic keeps speech during the beep or right after we talk
+        self.audio = audio or AudioSession(
+            capture=CAPTURE_MODE != "fixed",
+            echo_cancel=ECHO_CANCEL
+        )
+        self.mic = self.audio.mic
+        self.listen_mark = None
+        # the user talked over us; nothing more is said until the next listen
+        # picks up what they said (from listen_mark)
+        self.barged_in = False
+        # partial transcripts: listener(text, stable) and the one that ended a turn early
+        self.partial_listener = None
+        self.early_text = ""
+        # last partial decode, when it already covered the whole utterance
+        self.reused_stt = None
+        # Gemini answer started from a partial transcript, and how many this turn
+        self.speculation = None
+        self.speculated = 0
+
+        # gTTS while it's healthy, offline voice when it's slow or down
+        self.tts_router = TTSRouter()
+
+        # fixed prompts are synthesized once, then play instantly (and offline)
+        # cached the way speak() asks for them: one clip per sentence
+        self.tts_cache = TTSCache(decode=self.audio.decode)
+        prompts = {
+            language: [sentence for text in texts for sentence in split_sentences(text)]
+            for language, texts in STATIC_PROMPTS.items()
+        }
+        threading.Thread(
+            target=self.tts_cache.prewarm,
+            args=(prompts, self.tts_router.online.name, self.tts_router.online.synthesize),
+            daemon=True
+        ).start()
+
+        # command table compiled once, one scan per utterance
+        self.router = IntentRouter(slots={"contact": list(CONTACTS)})
+        # paraphrases the keywords miss, before we pay for a Gemini call
+        self.classifier = IntentClassifier()
+
+        # repeat questions are answered without a Gemini call
+        self.ai_cache = ResponseCache()
+        # recent turns so follow-ups make sense, within a token budget
+        self.memory = ConversationMemory()
+
+        # long answers: sentence N plays while N+1 is synthesized
+        self.speaker = StreamingSpeaker(self._tts, self._play_audio)
         
-        pygame.mixer.init()
-        
+        # Start reminder
+        self.start_reminder_thread()
+
+    def _load_resources(self):
+        """Connect the phone and get a warmed-up STT engine"""
         # Mobilerun connection
         try:
-            self.phone = Mobilerun(api_key=MOBILERUN_KEY)
+            self._phone = Mobilerun(api_key=MOBILERUN_KEY)
             print("Phone connected!")
         except:
-            self.phone = None
+            self._phone = None
             print("Phone not connected (phone features disabled)")
-        
-        # Start reminder
-        self.start_reminder_thread()
+        self.phone_ready.set()
+
+        try:
+            # shared across instances, a dashboard restart doesn't reload Whisper
+            stt = model_registry.acquire()
+            if self.closed:
+                # stopped while we were loading
+                model_registry.release(stt)
+                raise RuntimeError("assistant closed")
+            self.stt = stt
+            self.ready.set_result(True)
+        except Exception as e:
+            print(f"[Model Load Error]: {e}")
+            self.ready.set_exception(e)
+
+    def close(self):
+        """Release the audio devices and our reference on the shared STT model"""
+        self.closed = True
+        self._take_speculation(None)
+        self.audio.close()
+        self.mic = None
+        if self.stt is not None:
+            model_registry.release(self.stt)
+            self.stt = None
+        with self.stt_hi_lock:
+            if self.stt_hi is not None:
+                model_registry.release(self.stt_hi)
+                self.stt_hi = None
+
+    @property
+    def phone(self):
+        # phone features may be used before the loader thread gets there
+        self.phone_ready.wait(timeout=15)
+        return self._phone
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the STT engine is loaded; raises if loading failed"""
+        return self.ready.result(timeout=timeout)
 
     # sound
 
     def beep(self):
         """Play a short beep sound to indicate listening"""
         try:
-            sr = 16000
-            duration = 0.1
-            freq = 16000
-            t = np.linspace(0, duration, int(sr * duration), False)
-            tone = np.sin(2 * np.pi * freq * t) * 0.3
-            sd.play(tone, sr)
-            sd.wait()
-            time.sleep(0.6)
+            self.audio.play_cue("beep")
         except Exception as e:
             print(f"[Beep Error]: {e}")
 
+    def _tts(self, text):
+        """Decoded PCM for text, synthesized only on a cache miss"""
+        lang = "hi" if self.language == "hi" else "en"
+        online = self.tts_router.online.name
+
+        clip = self.tts_cache.get(text, lang, online)
+        if clip is None and not self.tts_router.online_healthy():
+            # online is down, an offline rendering from earlier will do
+            clip = self.tts_cache.get(text, lang, self.tts_router.local.name)
+        if clip is not None:
+            return clip
+
+        data, voice = self.tts_router.synthesize(text, lang)
+        return self.tts_cache.put(text, lang, voice, data)
+
+    def _play_audio(self, pcm):
+        """
+        Play decoded PCM from memory and wait for it to finish
+        Returns False if the user talked over it (barge-in), now or earlier
+        in this turn
+        """
+        if self.barged_in:
+            return False
+        playback = self.audio.play(pcm)
+        self.playback = playback
+        if self.mic and BARGE_IN:
+            threading.Thread(target=self._watch_barge_in, args=(playback,), daemon=True).start()
+
+        playback.wait()
+        self.playback = None
+        if playback.interrupted or self.barged_in:
+            return False
+
+        # next listen starts scanning from here
+        if self.mic:
+            self.listen_mark = self.mic.position
+        return True
+
+    def _watch_barge_in(self, playback):
+        start = watch_for_speech(self.mic, playback.done, self.barge_in_vad, BARGE_IN_MS)
+        if start is None or playback.done.is_set():
+            return
+
+        print("[Barge-in] Stopping playback, listening")
+        # next capture picks up what the user has already said
+        self.listen_mark = max(0, start - self.mic.ms_to_samples(VAD_PRE_ROLL_MS))
+        self.barged_in = True
+        playback.stop()
+
     def speak(self, text):
+        """Say text; False if the user barged in, callers should stop talking"""
+        if self.barged_in:
+            return False
         print("Braill-AI:", text)
         self.last_spoken = text.lower()
 
         try:
-            lang = "hi" if self.language == "hi" else "en"
-            
-            tts = gTTS(text=text, lang=lang, slow=False)
-            fd, path = tempfile.mkstemp(suffix=".mp3")
-            os.close(fd)
-            tts.save(path)
-            
-            pygame.mixer.music.load(path)
-            pygame.mixer.music.play()
-            
-            while pygame.mixer.music.get_busy():
-                pygame.time.Clock().tick(10)
-            
-            # cleanup
-            pygame.mixer.music.stop()
-            pygame.mixer.music.unload()
-            
-            # remove temp file
-            try:
-                os.remove(path)
-            except:
-                pass
-            
-            time.sleep(0.8)
+            sentences = split_sentences(text)
+            if len(sentences) > 1:
+                # first sentence starts playing as soon as it's synthesized
+                self.speaker.speak_iter(sentences)
+            else:
+                self._play_audio(self._tts(text))
             
         except Exception as e:
             print(f"[TTS Error]: {e}")
-            time.sleep(0.3)
+        return not self.barged_in
+
+    def speak_stream(self, sentences):
+        """
+        Speak sentences while they are still being produced (e.g. by ask_ai_stream)
+        Returns the sentences that were actually played
+        """
+        def shown():
+            for sentence in sentences:
+                print("Braill-AI:", sentence)
+                yield sentence
+
+        try:
+            spoken = self.speaker.speak_iter(shown())
+            self.last_spoken = " ".join(spoken).lower()
+            return spoken
+        except Exception as e:
+            print(f"[TTS Error]: {e}")
+            return []
 
     # stopping
     
@@ -142,6 +344,8 @@ class BraillAI:
         print("Stop requested - triggering goodbye...")
         self.stop_requested = True
         self.running = False
+        if self.playback:
+            self.playback.stop()
 
     #lang
 
@@ -165,6 +369,9 @@ class BraillAI:
             
             if "hindi" in text or "हिंदी" in text or "हिन्दी" in text:
                 self.language = "hi"
+                if HINDI_STT_ENGINE or HINDI_STT_MODEL_SIZE:
+                    # get the dedicated Hindi model loading while we talk
+                    threading.Thread(target=self._hindi_engine, daemon=True).start()
                 self.speak("आपने हिंदी चुनी है। अब आप मुझसे हिंदी में बात कर सकते हैं।")
                 return
             
@@ -181,29 +388,143 @@ class BraillAI:
         self.speak("Defaulting to English.")
 
     # hearing
+    def _record(self, stream_language=None, command=False):
+        """
+        Beep, then record one utterance as a float32 array
+        With stream_language set, partial transcripts are decoded while the
+        user talks; for a command (not a dictated note or message), an urgent
+        one ends the turn early with it in self.early_text
+        """
+        self.early_text = ""
+        self.reused_stt = None
+        self.barged_in = False
+        self._take_speculation(None)
+        self.speculated = 0
+        self.beep()
+        print("Listening...")
+
+        if self.mic is None:
+            audio = self.audio.record_fixed(MAX_UTTERANCE_SECONDS)
+            return self._prepare_audio(audio)
+
+        stop = threading.Event()
+        transcriber = None
+        engine = self._streaming_engine(stream_language)
+        if engine is not None:
+            transcriber = StreamingTranscriber(
+                engine,
+                self.mic,
+                language=stream_language,
+                step_ms=PARTIAL_STEP_MS,
+                prepare=self._prepare_audio,
+                on_partial=lambda text, stable: self._on_partial(text, stable, stop, command)
+            )
+
+        # returns as soon as the user stops talking
+        audio = self.audio.record(
+            vad=self.vad,
+            since=self.listen_mark,
+            pre_roll_ms=VAD_PRE_ROLL_MS,
+            max_seconds=MAX_UTTERANCE_SECONDS,
+            hangover_ms=VAD_HANGOVER_MS,
+            on_progress=transcriber.update if transcriber else None,
+            stop=stop
+        )
+        self.listen_mark = None
+        if transcriber:
+            transcriber.finish()
+            # the last partial decode already heard all of it: don't decode twice
+            self.reused_stt = transcriber.final_result()
+
+        return self._prepare_audio(audio)
+
+    def _prepare_audio(self, audio):
+        # trim silence, gate noise, level the gain; empty means nothing was said
+        # in place, audio may be the mic's scratch buffer
+        return condition(audio, min_rms=MIN_SPEECH_RMS)
+
+    def _streaming_engine(self, language):
+        """Engine for partial transcripts, None if streaming is off or not loaded yet"""
+        if not language or not STREAMING_STT:
+            return None
+        if not self.ready.done() or self.ready.exception():
+            return None
+        if language == "hi" and (HINDI_STT_ENGINE or HINDI_STT_MODEL_SIZE):
+            return self.stt_hi
+        return self.stt
+
+    def _on_partial(self, text, stable, stop, command):
+        if self.partial_listener:
+            self.partial_listener(text, stable)
+
+        # act before the utterance ends, but only on words two decodes agree on
+        # ("help" in a dictated note is part of the note)
+        if command and stable and not stop.is_set() and self._is_urgent(stable):
+            self.early_text = stable
+            stop.set()
+            return
+
+        # two decodes agree on the whole hypothesis: the question is probably
+        # complete, let Gemini work while the VAD waits out the pause
+        # (never for dictation, that's private text and not a question)
+        if SPECULATIVE_AI and command and stable and stable == text:
+            self._speculate(stable)
+
+    def _speculate(self, text):
+        spec = self.speculation
+        if spec is not None and spec.matches(text):
+            return
+        if len(text.split()) < 3 or self.speculated >= SPECULATE_MAX:
+            return
+        if self.router.route(text) is not None or self.classifier.classify(text) is not None:
+            # a command, handled locally
+            return
+
+        if spec is not None:
+            spec.cancel()
+        self.speculated += 1
+        print(f"[Speculative] Asking early: {text}")
+        self.speculation = Speculation(text, self.ask_ai_stream(text))
+
+    def _take_speculation(self, text):
+        """The early answer if it was for this question; any other one is cancelled"""
+        spec, self.speculation = self.speculation, None
+        if spec is None:
+            return None
+        if text is not None and spec.matches(text):
+            return spec
+        spec.cancel()
+        return None
+
+    def _classify(self, text):
+        """Local classifier result shaped like a router route, None means ask the AI"""
+        guess = self.classifier.classify(text)
+        if guess is None:
+            return None
+        print(f"[Intent] {guess['intent']} ({guess['score']:.2f}, like \"{guess['example']}\")")
+        # the keyword scan still finds who to call
+        contact = self.router.scan(text)[2].get("contact")
+        if guess["intent"] in ("call", "message") and contact is None:
+            # nobody to call, probably a question after all
+            return None
+        return {"intent": guess["intent"], "slots": {"contact": contact}}
+
+    def _is_urgent(self, text):
+        """Commands worth cutting the recording short for"""
+        route = self.router.route(text)
+        if route is None:
+            return False
+        if route["intent"] == "call":
+            return route["slots"]["contact"] is not None
+        return route["intent"] == "emergency"
+
     def listen_raw(self):
         try:
-            self.beep()
-            print("Listening...")
-            
-            audio = sd.rec(
-                int(16000 * 8), 
-                samplerate=16000, 
-                channels=1, 
-                dtype="float32"
-            )
-            sd.wait()
-        
-            audio = np.squeeze(audio) * 1.8
-            audio = np.clip(audio, -1.0, 1.0)
+            audio = self._record()
+            if audio.size == 0:
+                return ""
             
-            result = self.whisper_model.transcribe(
-                audio,
-                fp16=False,
-                language=None,
-                temperature=0.0
-            )
-            text = result["text"].strip().lower()
+            text = self._transcribe(audio, language=None)
             
             print("You said:", text)
             return text
@@ -212,35 +533,24 @@ class BraillAI:
             print(f"[Listen Error]: {e}")
             return ""
 
-    def listen(self):
+    def listen(self, command=False):
 
         try:
-            self.beep()
-            print("Listening...")
-            
-            # Rec
-            audio = sd.rec(
-                int(16000 * 8), 
-                samplerate=16000, 
-                channels=1, 
-                dtype="float32"
-            )
-            sd.wait()
-            
-            # Audio
-            audio = np.squeeze(audio) * 1.8
-            audio = np.clip(audio, -1.0, 1.0)
-            
-            if self.language == 'en':
-                result = self.whisper_model.transcribe(
-                    audio,
-                    fp16=False,
-                    language='en',
-                    temperature=0.0
-                )
-                text = result["text"].strip().lower()
+            audio = self._record(stream_language=self.language, command=command)
+
+            if self.early_text:
+                text = self.early_text
+                print("[Early dispatch] Acting on partial transcript")
+            elif audio.size == 0:
+                return ""
+            elif self.language == 'en':
+                if self.reused_stt is not None:
+                    print("[STT] Using the last partial decode, it covers the whole utterance")
+                    text = self.reused_stt["text"].lower()
+                else:
+                    text = self._transcribe(audio, language='en')
             else:
-                text = self._google_sr_recognize(audio, language='hi-IN')
+                text = self._recognize_hindi(audio, self.reused_stt)
             
             print("You said:", text)
             
@@ -248,47 +558,17 @@ class BraillAI:
             if not text or len(text.strip()) < 3:
                 return ""
             
-            text_lower = text.lower().strip()
-            
-            if self.last_spoken and len(self.last_spoken) > 5:
-                # avoid word overlap
-                ai_words = set(self.last_spoken.split())
-                user_words = set(text_lower.split())
-                overlap = ai_words.intersection(user_words)
-                
-                if len(overlap) > len(ai_words) * 0.5:
-                    return ""
-            echo_phrases = [
-                "what would you like",
-                "what medicine should",
-                "emergency detected",
-                "calling for help",
-                "what time",
-                "say the hour",
-                "i didn't hear",
-                "having trouble",
-                "got it i'll remember",
-                "remind you about",
-                "beeping",
-                "that's beeping",
-            ]
-            
             if len(text.strip()) > 0:
                 unique_chars = set(text.strip())
                 if len(unique_chars) <= 3 and any(c in unique_chars for c in ['!', '?', '.', '-', ' ']):
                     return ""
-            
-            for phrase in echo_phrases:
-                if phrase in text_lower:
-                    print(f"[ECHO DETECTED] Found AI phrase: '{phrase}' - ignoring")
-                    return ""
-            
-            question_words = ["what", "which", "when", "where", "how", "should", "would", "could"]
-            words = text_lower.split()
-            if len(words) > 4:
-                question_count = sum(1 for word in words if word in question_words)
-                if question_count >= 2:
-                    return ""
+
+            if self._echo_cancelled():
+                # the mic never heard us, no need to second-guess the text
+                return text
+
+            if self._looks_like_echo(text.lower().strip()):
+                return ""
             
             return text
             
@@ -296,6 +576,90 @@ class BraillAI:
             print(f"[Listen Error]: {e}")
             return ""
 
+    def _echo_cancelled(self):
+        echo = self.audio.echo
+        return echo is not None and echo.converged
+
+    def _looks_like_echo(self, text_lower):
+        """Text heuristics for hearing ourselves, used until echo cancellation has converged"""
+        if self.last_spoken and len(self.last_spoken) > 5:
+            # avoid word overlap
+            ai_words = set(self.last_spoken.split())
+            user_words = set(text_lower.split())
+            overlap = ai_words.intersection(user_words)
+            
+            if len(overlap) > len(ai_words) * 0.5:
+                return True
+        echo_phrases = [
+            "what would you like",
+            "what medicine should",
+            "emergency detected",
+            "calling for help",
+            "what time",
+            "say the hour",
+            "i didn't hear",
+            "having trouble",
+            "got it i'll remember",
+            "remind you about",
+            "beeping",
+            "that's beeping",
+        ]
+        
+        for phrase in echo_phrases:
+            if phrase in text_lower:
+                print(f"[ECHO DETECTED] Found AI phrase: '{phrase}' - ignoring")
+                return True
+        
+        question_words = ["what", "which", "when", "where", "how", "should", "would", "could"]
+        words = text_lower.split()
+        if len(words) > 4:
+            question_count = sum(1 for word in words if word in question_words)
+            if question_count >= 2:
+                return True
+        
+        return False
+
+    def _run_stt(self, engine, audio, language):
+        result = engine.transcribe(audio, language=language)
+        timings = result["timings"]
+        print(
+            f"[STT] {engine.name}/{language or 'auto'}: {timings['transcribe']:.2f}s for "
+            f"{timings['audio']:.1f}s audio (confidence {result['confidence']:.2f})"
+        )
+        return result
+
+    def _transcribe(self, audio, language=None):
+        self.wait_until_ready()
+        return self._run_stt(self.stt, audio, language)["text"].lower()
+
+    def _hindi_engine(self):
+        """The English engine, unless HINDI_STT_ENGINE/SIZE ask for another one"""
+        self.wait_until_ready()
+        if not HINDI_STT_ENGINE and not HINDI_STT_MODEL_SIZE:
+            return self.stt
+
+        with self.stt_hi_lock:
+            if self.stt_hi is None and not self.closed:
+                self.stt_hi = model_registry.acquire(
+                    HINDI_STT_ENGINE or self.stt.name,
+                    HINDI_STT_MODEL_SIZE or self.stt.size
+                )
+            return self.stt_hi
+
+    def _recognize_hindi(self, audio, result=None):
+        """
+        Local Hindi transcription, Google SR only if enabled and local is weak
+        `result` is an engine result for this audio that's already there
+        """
+        if result is None:
+            result = self._run_stt(self._hindi_engine(), audio, "hi")
+        text = result["text"].lower()
+
+        if HINDI_STT_FALLBACK == "google" and (not text or result["confidence"] < HINDI_MIN_CONFIDENCE):
+            print("[STT] Weak local Hindi result, trying Google SR")
+            text = self._google_sr_recognize(audio, language='hi-IN') or text
+        return text
+
     def _google_sr_recognize(self, audio_data, language='en-US'):
         try:
             # Convert numpy array
@@ -361,110 +725,57 @@ class BraillAI:
 
     # reminder
 
-    def add_reminder(self):
-        """Add medication reminder"""
-        self.speak(
-            "कौन सी दवा के लिए रिमाइंडर सेट करना है?"
-            if self.language == "hi"
-            else
-            "What medicine should I remind you about?"
-        )
-        
-        medicine = self.listen()
+    def add_reminder(self, request=""):
+        """
+        Add medication reminder
+        Whatever the request already says ("remind me to take aspirin at
+        8:30 tonight") is used; only the missing parts are asked for
+        """
+        when = time_parser.parse(request) if request else None
+        medicine = self._reminder_subject(request, when) if request else None
+
         if not medicine:
             self.speak(
-                "मुझे सुनाई नहीं दिया।"
+                "कौन सी दवा के लिए रिमाइंडर सेट करना है?"
                 if self.language == "hi"
                 else
-                "I didn't hear that."
+                "What medicine should I remind you about?"
             )
-            return
+            
+            medicine = self.listen()
+            if not medicine:
+                self.speak(
+                    "मुझे सुनाई नहीं दिया।"
+                    if self.language == "hi"
+                    else
+                    "I didn't hear that."
+                )
+                return
         
         print(f"[DEBUG] Medicine captured: {medicine}")
         
-        self.speak(
-            "कितने बजे? जैसे आठ बजे सुबह या दो बजे शाम।"
-            if self.language == "hi"
-            else
-            "What time? Say the hour like eight AM or two PM."
-        )
-        
-        time_text = self.listen()
-        if not time_text:
+        if when is None:
             self.speak(
-                "समय सुनाई नहीं दिया।"
+                "कितने बजे? जैसे आठ बजे सुबह या दो बजे शाम।"
                 if self.language == "hi"
                 else
-                "I didn't hear the time."
+                "What time? Say the hour like eight AM or two PM."
             )
-            return
+            
+            time_text = self.listen()
+            if not time_text:
+                self.speak(
+                    "समय सुनाई नहीं दिया।"
+                    if self.language == "hi"
+                    else
+                    "I didn't hear the time."
+                )
+                return
+            
+            # a lone "eight" is fine here, it answers "what time?"
+            when = time_parser.parse(time_text, bare_numbers=True)
         
-        import re
-        #time management
-        hour = None
-        minute = 0
-        time_text_lower = time_text.lower()
-        
-        time_match = re.search(r'(\d{1,2}):?(\d{2})?\s*(am|pm|a\.m\.|p\.m\.)?', time_text_lower)
-        
-        if time_match:
-            hour = int(time_match.group(1))
-            if time_match.group(2):
-                minute = int(time_match.group(2))
-            am_pm = time_match.group(3)
-            
-            
-            if hour > 12 and minute == 0:
-                hour_str = str(hour)
-                if len(hour_str) == 3: 
-                    hour = int(hour_str[0])
-                    minute = int(hour_str[1:])
-                elif len(hour_str) == 4:
-                    hour = int(hour_str[:2])
-                    minute = int(hour_str[2:])
-        
-            if minute > 59:
-                minute = 0
-            
-            # AM/PM
-            if am_pm and 'p' in am_pm:  # pm
-                if hour != 12 and hour <= 12:
-                    hour += 12
-            elif am_pm and 'a' in am_pm and hour == 12:  # am
-                hour = 0
-            elif not am_pm and hour <= 12:
-                if any(x in time_text_lower for x in ['evening', 'night', 'pm', 'शाम', 'रात']):
-                    if hour != 12:
-                        hour += 12
-                elif any(x in time_text_lower for x in ['morning', 'am', 'सुबह']):
-                    if hour == 12:
-                        hour = 0
-                else:
-                    if 1 <= hour <= 7:
-                        hour += 12
-        else:
-            number_words = {
-                'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5,
-                'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10,
-                'eleven': 11, 'twelve': 12,
-                'एक': 1, 'दो': 2, 'तीन': 3, 'चार': 4, 'पांच': 5,
-                'छह': 6, 'सात': 7, 'आठ': 8, 'नौ': 9, 'दस': 10
-            }
-            
-            for word, num in number_words.items():
-                if word in time_text_lower:
-                    hour = num
-                    break
-            
-            if hour:
-                if any(x in time_text_lower for x in ['pm', 'evening', 'night', 'शाम', 'रात']):
-                    if hour != 12:
-                        hour += 12
-                elif any(x in time_text_lower for x in ['am', 'morning', 'सुबह']):
-                    if hour == 12:
-                        hour = 0
-        
-        if hour is None or hour > 23:
+        if when is None:
             self.speak(
                 "समय समझ नहीं आया। कृपया फिर से कोशिश करें।"
                 if self.language == "hi"
@@ -473,18 +784,23 @@ class BraillAI:
             )
             return
         
+        hour, minute = when["hour"], when["minute"]
         time_str = f"{hour:02d}:{minute:02d}"
-        print(f"[DEBUG] Parsed time: {time_str}")
+        print(f"[DEBUG] Parsed time: {time_str} date={when['date']} repeat={when['repeat']}")
         
-        # Save reminder
-        with open(REMINDER_FILE, "r") as f:
-            reminders = json.load(f)
-        
-        reminders.append({
+        # Save reminder; without a date it repeats every day
+        reminder = {
             "time": time_str,
             "medicine": medicine,
             "last_triggered": ""
-        })
+        }
+        if when["date"]:
+            reminder["date"] = when["date"].isoformat()
+
+        with open(REMINDER_FILE, "r") as f:
+            reminders = json.load(f)
+        
+        reminders.append(reminder)
         
         with open(REMINDER_FILE, "w") as f:
             json.dump(reminders, f, indent=2)
@@ -494,14 +810,30 @@ class BraillAI:
             display_hour = 12
         am_pm_display = "AM" if hour < 12 else "PM"
         display_time = f"{display_hour}:{minute:02d} {am_pm_display}"
+
+        day = ""
+        if when["date"]:
+            days_ahead = (when["date"] - datetime.date.today()).days
+            if days_ahead == 1:
+                day = " कल" if self.language == "hi" else " tomorrow"
+            elif days_ahead > 1:
+                day = f" {when['date'].strftime('%d %B')}" if self.language == "hi" else f" on {when['date'].strftime('%B %d')}"
+        elif when["repeat"]:
+            day = " रोज़" if self.language == "hi" else " every day"
         
         self.speak(
-            f"{medicine} के लिए {display_time} बजे रिमाइंडर सेट हो गया।"
+            f"{medicine} के लिए{day} {display_time} बजे रिमाइंडर सेट हो गया।"
             if self.language == "hi"
             else
-            f"Reminder set for {medicine} at {display_time}."
+            f"Reminder set for {medicine} at {display_time}{day}."
         )
 
+    def _reminder_subject(self, request, when):
+        """What the reminder is for, from "remind me to take aspirin at 8", or None"""
+        text = time_parser.strip_time(request, when) if when else time_parser.normalize(request)
+        match = REMINDER_SUBJECT.search(text)
+        return match.group(1).strip() if match else None
+
     def _number_to_word(self, n):
         words = {
             1: "one", 2: "two", 3: "three", 4: "four", 5: "five",
@@ -513,14 +845,19 @@ class BraillAI:
     def start_reminder_thread(self):
         def loop():
             while self.running:
-                now = datetime.datetime.now().strftime("%H:%M")
+                now = datetime.datetime.now()
+                clock = now.strftime("%H:%M")
+                today = now.date().isoformat()
+                # date included, so a daily reminder fires again tomorrow
+                stamp = f"{today} {clock}"
                 
                 try:
                     with open(REMINDER_FILE, "r") as f:
                         reminders = json.load(f)
                     
                     for reminder in reminders:
-                        if reminder["time"] == now and reminder["last_triggered"] != now:
+                        due = reminder["time"] == clock and reminder.get("date", today) == today
+                        if due and reminder["last_triggered"] != stamp:
                             msg = (
                                 f"{reminder['medicine']} लेने का समय हो गया है।"
                                 if self.language == "hi"
@@ -528,7 +865,13 @@ class BraillAI:
                                 f"Time to take your {reminder['medicine']}."
                             )
                             self.speak(msg)
-                            reminder["last_triggered"] = now
+                            reminder["last_triggered"] = stamp
+                    
+                    # one-off reminders are done once they've fired or their day has passed
+                    reminders = [
+                        r for r in reminders
+                        if "date" not in r or (r["date"] >= today and r["last_triggered"] != stamp)
+                    ]
                     
                     with open(REMINDER_FILE, "w") as f:
                         json.dump(reminders, f, indent=2)
@@ -608,12 +951,13 @@ class BraillAI:
             )
             
             for i, note in enumerate(notes[-3:], 1):
-                self.speak(
+                if not self.speak(
                     f"नोट {i}: {note['text']}"
                     if self.language == "hi"
                     else
                     f"Note {i}: {note['text']}"
-                )
+                ):
+                    return
 
     def clear_notes(self):
         """Clear all notes"""
@@ -778,28 +1122,72 @@ class BraillAI:
     # gemini
 
     def ask_ai(self, question):
+        """Whole answer as one string, for callers that don't speak as it streams"""
+        answer = " ".join(self.ask_ai_stream(question))
+        self.memory.record(question, answer)
+        return answer
+
+    def _is_follow_up(self, question):
+        """Depends on earlier turns, so a cached answer to the same words may not fit"""
+        return bool(self.memory.turns) and is_follow_up(question)
+
+    def _ai_prompt(self, question, template):
+        prompt, report = self.memory.build(template.format(question=question))
+        print(
+            f"[AI] Prompt ~{report['tokens']}/{report['budget']} tokens, "
+            f"{report['turns']} recent turns{' + summary' if report['summary'] else ''}"
+        )
+        return prompt
+
+    def _ai_too_slow(self):
+        return (
+            "माफ़ कीजिए, जवाब आने में देर हो रही है। फिर से पूछिए।"
+            if self.language == "hi"
+            else
+            "Sorry, that's taking too long. Please ask me again."
+        )
+
+    def ask_ai_stream(self, question):
+        """
+        Gemini's answer (or a cached one) sentence by sentence as it streams,
+        so the first one can be spoken before the rest exists
+        The caller records the turn in self.memory (only what was heard)
+        """
+        language = "hi" if self.language == "hi" else "en"
+        template = AI_PROMPTS[language]
+        follow_up = self._is_follow_up(question)
+
+        cached = None if follow_up else self.ai_cache.get(question, language, template, AI_MODEL)
+        if cached is not None:
+            print(f"[AI Cache] hit ({self.ai_cache.stats()['hit_rate']:.0%} hit rate)")
+            yield from split_sentences(cached)
+            return
+
+        sentences = []
         try:
-            prompt = (
-                f"बहुत छोटा उत्तर दें (1-2 वाक्य)। कोई काम करने के बारे में मत बताओ, सिर्फ जवाब दो। प्रश्न: {question}"
-                if self.language == "hi"
-                else
-                f"Give a very short answer (1-2 sentences). Don't describe actions or make up results. Just answer the question. Question: {question}"
-            )
-            
-            response = genai_client.models.generate_content(
-                model="gemini-2.5-flash-lite",
-                contents=prompt
-            )
-            
-            return response.text.strip()
+            chunks = llm.stream(AI_MODEL, self._ai_prompt(question, template))
+            for sentence in stream_sentences(chunks):
+                sentences.append(sentence)
+                yield sentence
+        except DeadlineExceeded as e:
+            print(f"[AI Timeout]: {e}")
+            if not sentences:
+                yield self._ai_too_slow()
+            return
         except Exception as e:
             print(f"[AI Error]: {e}")
-            return (
-                "मुझे समझ नहीं आया। कुछ और पूछिए।"
-                if self.language == "hi"
-                else
-                "I'm not sure about that. Try asking something else."
-            )
+            if not sentences:
+                yield (
+                    "मुझे समझ नहीं आया। कुछ और पूछिए।"
+                    if self.language == "hi"
+                    else
+                    "I'm not sure about that. Try asking something else."
+                )
+            return
+
+        # only complete, self-contained answers are cached
+        if not follow_up:
+            self.ai_cache.put(question, language, template, AI_MODEL, " ".join(sentences))
 
     def control_phone(self, task):
         """Control phone using Mobilerun"""
@@ -855,7 +1243,7 @@ class BraillAI:
                 time.sleep(0.1) 
                 continue
             
-            text = self.listen()
+            text = self.listen(command=True)
             
             # Check if stop was requested from dash
             if self.stop_requested:
@@ -870,8 +1258,12 @@ class BraillAI:
             if not text:
                 continue
             
+            route = self.router.route(text) or self._classify(text)
+            intent = route["intent"] if route else None
+            spec = self._take_speculation(text if route is None else None)
+
             # Exit commands
-            if any(word in text for word in ["bye", "goodbye", "exit", "quit", "stop", "बाय", "अलविदा"]):
+            if intent == "exit":
                 self.speak(
                     "अलविदा! ध्यान रखिए।"
                     if self.language == "hi"
@@ -882,63 +1274,53 @@ class BraillAI:
                 break
             
             # Emergency
-            if any(word in text for word in ["emergency", "help", "sos", "bachao", "बचाओ", "मदद"]):
+            if intent == "emergency":
                 self.emergency()
                 continue
             
             # Reminders
-            if any(word in text for word in ["remind", "reminder", "medicine", "दवा", "रिमाइंडर"]):
-                self.add_reminder()
+            if intent == "reminder":
+                self.add_reminder(text)
                 continue
             
-            # Notes - save
-            if any(word in text for word in ["remember", "note", "save", "याद", "नोट"]):
-                if any(word in text for word in ["this", "that", "यह", "वह"]):
-                    self.save_note()
-                    continue
+            # Notes
+            if intent == "save_note":
+                self.save_note()
+                continue
             
-            # Notes - read
-            if any(word in text for word in ["read notes", "my notes", "नोट्स", "यादें"]):
+            if intent == "read_notes":
                 self.read_notes()
                 continue
             
-            # Notes - clear
-            if any(word in text for word in ["delete notes", "clear notes", "नोट्स डिलीट"]):
+            if intent == "clear_notes":
                 self.clear_notes()
                 continue
             
-            # Call contacts
-            if "call" in text or "कॉल" in text:
-                for contact in CONTACTS:
-                    if contact in text:
-                        self.call_contact(contact)
-                        break
-                else:
-                    continue
+            # Call / message contacts, nothing to do without a known contact
+            if intent == "call":
+                if route["slots"]["contact"]:
+                    self.call_contact(route["slots"]["contact"])
                 continue
             
-            # Message contacts
-            if any(word in text for word in ["message", "text", "send", "मैसेज", "भेजो"]):
-                for contact in CONTACTS:
-                    if contact in text:
-                        self.send_message(contact)
-                        break
-                else:
-                    continue
+            if intent == "message":
+                if route["slots"]["contact"]:
+                    self.send_message(route["slots"]["contact"])
                 continue
             
-            phone_keywords = ['open', 'search', 'find', 'navigate', 'map', 'whatsapp', 
-                            'photo', 'launch', 'खोलो', 'ढूंढो', 'take me', 'nearest',
-                            'hospital', 'restaurant', 'directions', 'route', 'location',
-                            'weather', 'play', 'video', 'music', 'book', 'order',
-                            'मुझे ले जाओ', 'सबसे नज़दीक', 'अस्पताल', 'दिशा']
-            
-            if any(word in text for word in phone_keywords):
+            if intent == "phone":
                 self.control_phone(text)
                 continue
         
-            answer = self.ask_ai(text)
-            self.speak(answer)
+            # first sentence plays while Gemini is still writing the rest
+            if spec is not None:
+                print("[Speculative] Using the answer started during the question")
+                spoken = self.speak_stream(spec.sentences())
+            else:
+                spoken = self.speak_stream(self.ask_ai_stream(text))
+            if spoken:
+                self.memory.record(text, " ".join(spoken))
+
+        self.close()
 
 
 # start
@@ -0,0 +1,109 @@
+import os
+import re
+import collections
+
+AI_CONTEXT_TOKENS = int(os.getenv("AI_CONTEXT_TOKENS", "600"))
+AI_MEMORY_TURNS = int(os.getenv("AI_MEMORY_TURNS", "4"))
+AI_SUMMARY_TOKENS = int(os.getenv("AI_SUMMARY_TOKENS", "150"))
+
+# questions that lean on the previous turn ("and tomorrow?", "who founded it?")
+FOLLOW_UP = re.compile(
+    r"^(and|but|also|what about|how about|why|then)\b|\b(it|its|that|this|those|these|he|she|him|her|they|them|their|there)\b"
+    r"|(?<![\wऀ-ॿ])(और|उसका|उसकी|उसके|वह|वो|उन्हें|वहाँ|इसका|इसकी)(?![\wऀ-ॿ])",
+    re.IGNORECASE
+)
+
+
+def estimate_tokens(text):
+    """
+    Rough token count without a tokenizer
+    ~4 bytes of UTF-8 per token: English words come out at about 1.3
+    tokens, Devanagari (3 bytes a letter) correctly costs more
+    """
+    return (len(text.encode("utf-8")) + 3) // 4
+
+
+def first_sentence(text, max_chars=120):
+    sentence = re.split(r"(?<=[.!?।])\s", text.strip(), maxsplit=1)[0]
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars].rsplit(" ", 1)[0] + "..."
+
+
+def is_follow_up(question):
+    return bool(FOLLOW_UP.search(question.strip()))
+
+
+class ConversationMemory:
+    """
+    Recent Q&A turns plus a rolling summary of older ones
+    The last max_turns turns are kept verbatim. Older turns are folded
+    into the summary as "question -> first sentence of the answer", and
+    the summary's oldest lines drop off past summary_tokens. build() puts
+    as much of this as fits in token_budget in front of the question,
+    newest turns first.
+    """
+
+    def __init__(self, token_budget=AI_CONTEXT_TOKENS, max_turns=AI_MEMORY_TURNS,
+                 summary_tokens=AI_SUMMARY_TOKENS):
+        self.token_budget = token_budget
+        self.max_turns = max_turns
+        self.summary_tokens = summary_tokens
+        self.turns = collections.deque()
+        self.summary = collections.deque()
+        self.last_report = None
+
+    def record(self, question, answer):
+        self.turns.append((question.strip(), answer.strip()))
+        while len(self.turns) > self.max_turns:
+            old_question, old_answer = self.turns.popleft()
+            self.summary.append(f"{old_question} -> {first_sentence(old_answer)}")
+        while len(self.summary) > 1 and estimate_tokens("\n".join(self.summary)) > self.summary_tokens:
+            self.summary.popleft()
+
+    def clear(self):
+        self.turns.clear()
+        self.summary.clear()
+
+    def build(self, prompt):
+        """
+        `prompt` (instructions + question) with as much history as fits
+        Returns (full prompt, report); report has the token estimate and
+        what was included
+        """
+        used = estimate_tokens(prompt)
+        budget = self.token_budget - used
+
+        turns = []
+        for question, answer in reversed(self.turns):
+            line = f"User: {question}\nAssistant: {answer}"
+            cost = estimate_tokens(line) + 1
+            if cost > budget:
+                break
+            turns.append(line)
+            budget -= cost
+        turns.reverse()
+
+        summary = ""
+        # only worth it if every recent turn fit
+        if self.summary and len(turns) == len(self.turns):
+            text = "Earlier: " + "; ".join(self.summary)
+            if estimate_tokens(text) + 1 <= budget:
+                summary = text
+                budget -= estimate_tokens(text) + 1
+
+        parts = []
+        if summary or turns:
+            parts.append("Conversation so far (use it only if the question refers to it):")
+            if summary:
+                parts.append(summary)
+            parts.extend(turns)
+            parts.append("")
+        parts.append(prompt)
+        full = "\n".join(parts)
+
+        self.last_report = {
+            "tokens": estimate_tokens(full),
+            "budget": self.token_budget,
+            "turns": len(turns),
+            "summary": bool(summary)
+        }
+        return full, self.last_report
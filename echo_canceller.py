@@ -0,0 +1,124 @@
+import os
+import threading
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from audio_processing import SAMPLE_RATE, resample
+
+ECHO_TAPS = int(os.getenv("ECHO_TAPS", "512"))
+ECHO_STEP = float(os.getenv("ECHO_STEP", "4"))
+ECHO_DELAY_MS = int(os.getenv("ECHO_DELAY_MS", "40"))
+ECHO_DOUBLE_TALK = float(os.getenv("ECHO_DOUBLE_TALK", "0.5"))
+
+
+def pcm_to_reference(pcm, rate):
+    """Mixer PCM (int16, frames x channels) as 16 kHz mono float32"""
+    mono = pcm.astype(np.float32).mean(axis=1) / 32768
+    return resample(mono, rate)
+
+
+class EchoCanceller:
+    """
+    Removes what the assistant is saying from the mic signal
+    The clip being played is the reference. A block NLMS filter learns the
+    speaker-to-mic path (bulk delay_ms plus `taps` samples of room) and
+    subtracts its echo estimate from every mic frame; what's left is the
+    user. Adaptation pauses while the user talks over the clip (Geigel
+    double-talk test) so their voice doesn't get learned as echo.
+    The filter is kept between clips, the room doesn't change per sentence.
+    """
+
+    def __init__(self, taps=ECHO_TAPS, step=ECHO_STEP, delay_ms=ECHO_DELAY_MS,
+                 double_talk=ECHO_DOUBLE_TALK, sample_rate=SAMPLE_RATE):
+        self.taps = taps
+        self.step = step
+        self.delay = int(sample_rate * delay_ms / 1000)
+        self.double_talk = double_talk
+        self.weights = np.zeros(taps, dtype=np.float32)
+        # keeps the update sane when the reference is near silent
+        self.eps = taps * 1e-6
+
+        self.reference = None
+        self.start = 0
+        self.playback = None
+        # echo return loss enhancement in dB, smoothed; how much echo we remove
+        self.erle = 0.0
+        self.lock = threading.Lock()
+
+    def set_reference(self, pcm, rate, start, playback=None):
+        """`pcm` starts playing now, at mic position `start`"""
+        reference = pcm_to_reference(pcm, rate)
+        with self.lock:
+            self.reference = reference
+            self.start = start
+            self.playback = playback
+
+    def clear(self):
+        with self.lock:
+            self.reference = None
+            self.playback = None
+
+    @property
+    def converged(self):
+        """True once the filter removes a useful amount of echo (>= 6 dB)"""
+        return self.erle >= 6.0
+
+    def _window(self, reference, first, n):
+        # reference samples first - taps + 1 .. first + n - 1, silence outside the clip
+        lo = first - self.taps + 1
+        hi = first + n
+        window = np.zeros(hi - lo, dtype=np.float32)
+        a, b = max(lo, 0), min(hi, len(reference))
+        if a < b:
+            window[a - lo:b - lo] = reference[a:b]
+        return window
+
+    def process(self, frame, position):
+        """Echo-free copy of a mic frame that starts at mic `position`"""
+        with self.lock:
+            reference, start, playback = self.reference, self.start, self.playback
+        if reference is None:
+            return frame
+
+        n = len(frame)
+        first = position - start - self.delay
+        if playback is not None and playback.interrupted:
+            self.clear()
+            return frame
+        if first - self.taps + 1 >= len(reference):
+            # clip and its echo tail are over
+            self.clear()
+            return frame
+        if first + n <= 0:
+            # not audible yet
+            return frame
+
+        window = self._window(reference, first, n)
+        # row i holds reference[first + i], reference[first + i - 1], ...
+        rows = sliding_window_view(window, self.taps)[:, ::-1]
+        echo = rows @ self.weights
+        error = frame - echo
+
+        peak_ref = float(np.max(np.abs(window)))
+        near_end = float(np.max(np.abs(frame))) > self.double_talk * peak_ref
+        if not near_end and peak_ref > 0:
+            # mean of the n per-sample gradients, each normalized by the
+            # average tap-vector energy; summing them would be n times the step
+            norm = float(np.einsum("ij,ij->", rows, rows)) / n + self.eps
+            self.weights += (self.step / (norm * n)) * (rows.T @ error)
+
+            mic_power = float(np.dot(frame, frame)) + 1e-10
+            left_power = float(np.dot(error, error)) + 1e-10
+            self.erle = 0.95 * self.erle + 0.05 * 10 * np.log10(mic_power / left_power)
+
+            if not (np.isfinite(self.weights).all() and np.isfinite(self.erle)) or left_power > 100 * mic_power:
+                # diverged (or on its way): start over rather than turn every
+                # later frame into noise or NaN
+                print("[Echo Error]: filter diverged, resetting")
+                self.reset()
+                return frame
+
+        return error.astype(np.float32, copy=False)
+
+    def reset(self):
+        self.weights[:] = 0
+        self.erle = 0.0
@@ -0,0 +1,117 @@
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+import torch
+import whisper
+
+# How long the service waits for more sessions before decoding a batch
+BATCH_WINDOW_MS = int(os.getenv("STT_BATCH_WINDOW_MS", "50"))
+MAX_BATCH = int(os.getenv("STT_MAX_BATCH", "8"))
+
+
+class BatchedWhisperService:
+    """
+    One Whisper model shared by every assistant session in the process
+    Utterances submitted within window_ms of each other are padded to a
+    30 second log-mel window and decoded together with a single
+    whisper.decode() call (one batched encoder and decoder pass), then
+    each caller's Future gets its own DecodingResult.
+    Only utterances up to 30 seconds fit a batch.
+    close() stops the worker thread, which otherwise keeps the model alive.
+    """
+
+    def __init__(self, model, window_ms=BATCH_WINDOW_MS, max_batch=MAX_BATCH):
+        self.model = model
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.requests = queue.Queue()
+        self.closed = False
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, audio, language=None):
+        """Queue one utterance; the Future resolves to (DecodingResult, batch size)"""
+        future = Future()
+        if self.closed:
+            future.set_exception(RuntimeError("STT service closed"))
+            return future
+        self.requests.put((audio, language, future))
+        return future
+
+    def close(self, timeout=30):
+        """Finish what's queued, then stop the worker; later submits fail"""
+        # None on the queue is the stop signal
+        self.closed = True
+        self.requests.put(None)
+        self.thread.join(timeout)
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is not None:
+                request[2].set_exception(RuntimeError("STT service closed"))
+
+    def _collect(self):
+        """Next batch; empty once close() was called"""
+        first = self.requests.get()
+        if first is None:
+            return []
+        batch = [first]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if request is None:
+                # decode this batch first, stop on the next round
+                self.requests.put(None)
+                break
+            batch.append(request)
+        return batch
+
+    def _loop(self):
+        while True:
+            batch = self._collect()
+            if not batch:
+                return
+
+            # one DecodingOptions per pass, so group by requested language
+            by_language = {}
+            for request in batch:
+                by_language.setdefault(request[1], []).append(request)
+
+            for language, requests in by_language.items():
+                self._decode(language, requests)
+
+    def _decode(self, language, requests):
+        try:
+            mels = torch.stack([
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(audio),
+                    n_mels=self.model.dims.n_mels
+                )
+                for audio, _, _ in requests
+            ]).to(self.model.device)
+
+            options = whisper.DecodingOptions(
+                language=language,
+                temperature=0.0,
+                fp16=False,
+                without_timestamps=True
+            )
+            with torch.no_grad():
+                results = whisper.decode(self.model, mels, options)
+        except Exception as e:
+            for _, _, future in requests:
+                future.set_exception(e)
+            return
+
+        for (_, _, future), result in zip(requests, results):
+            future.set_result((result, len(requests)))
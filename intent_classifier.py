@@ -0,0 +1,311 @@
+import os
+import re
+import time
+import numpy as np
+
+INTENT_MIN_SCORE = float(os.getenv("INTENT_MIN_SCORE", "0.5"))
+# the best intent must beat the runner-up intent by this much
+INTENT_MARGIN = float(os.getenv("INTENT_MARGIN", "0.05"))
+
+TOKEN = re.compile(r"[\wऀ-ॿ]+")
+
+# example phrasings per intent, English and Hindi; add more to teach it
+# paraphrases. exit is left out on purpose, a fuzzy match must never quit.
+# "none" holds general questions that share phrasing with commands
+# ("what are my rights", "write an email"); landing there means ask the AI
+EXAMPLES = {
+    "emergency": [
+        "i fell down and can't get up",
+        "i fell",
+        "i am hurt please get someone",
+        "i need an ambulance",
+        "something is wrong i feel very sick",
+        "i can't breathe",
+        "i have chest pain",
+        "i am in danger",
+        "मैं गिर गया हूँ",
+        "मुझे चोट लगी है",
+        "एम्बुलेंस बुलाओ",
+        "मेरी तबीयत बहुत खराब है",
+    ],
+    "reminder": [
+        "i need my pills set for tonight",
+        "set an alarm for my tablets",
+        "don't let me forget my pills",
+        "tell me when it's time to take my medication",
+        "alert me at 9 pm",
+        "set a reminder for the doctor appointment",
+        "गोली याद दिलाना",
+        "मुझे दवाई लेने के लिए बताना",
+        "सुबह आठ बजे अलार्म लगाओ",
+        "रात को गोली की याद दिलाओ",
+    ],
+    "save_note": [
+        "write this down",
+        "keep this in mind for me",
+        "make a note the keys are in the drawer",
+        "store this information",
+        "jot this down",
+        "jot down that the door code is 1234",
+        "इसे लिख लो",
+        "यह बात लिख लो",
+        "इसे सेव कर लो",
+    ],
+    "read_notes": [
+        "read back the things i asked you to remember",
+        "repeat my saved notes",
+        "what did i ask you to remember",
+        "tell me what i saved",
+        "show my saved notes",
+        "what are my notes",
+        "मैंने क्या लिखवाया था",
+        "मेरी बातें सुनाओ",
+        "मेरे नोट्स पढ़ो",
+    ],
+    "clear_notes": [
+        "erase everything i saved",
+        "forget all my notes",
+        "remove my saved notes",
+        "wipe my notes",
+        "सब नोट्स मिटा दो",
+        "मेरी बातें भूल जाओ",
+    ],
+    "call": [
+        "ring my mom",
+        "ring my sister",
+        "give my sister a ring",
+        "phone my dad",
+        "dial my sister",
+        "get my brother on the phone",
+        "मम्मी को फोन करो",
+        "पापा को फोन लगाओ",
+    ],
+    "message": [
+        "tell my mom i am fine",
+        "let my dad know i reached home",
+        "write to my sister",
+        "sms my friend",
+        "मम्मी को बोलो मैं ठीक हूँ",
+        "पापा को खबर दो",
+    ],
+    "phone": [
+        "navigate to the station",
+        "directions to the station",
+        "show me the way home",
+        "is it going to rain today",
+        "put on some songs",
+        "गाना बजाओ",
+        "get me a cab",
+        "check my whatsapp",
+        "take a picture",
+        "स्टेशन कैसे जाऊं",
+        "गाने चलाओ",
+        "आज बारिश होगी क्या",
+        "टैक्सी बुलाओ",
+    ],
+    "none": [
+        "what are stars made of",
+        "what are my options for dinner",
+        "tell me what a black hole is",
+        "tell me about the history of india",
+        "show me how to be more patient",
+        "how do i write a letter",
+        "write a poem about rain",
+        "what is the meaning of this song",
+        "how do i make my phone faster",
+        "who wrote this book",
+        "क्या हुआ था",
+        "यह गाना किसने लिखा",
+    ],
+}
+
+# shared frames like "what are my" or "tell me what" aren't evidence; the
+# text must also say something only that intent is about (prefixes, so
+# "note" covers "notes")
+KEYWORDS = {
+    "emergency": r"fell|fall|hurt|injur|ambulance|sick|breath|chest|pain|danger|bleed|"
+                 r"गिर|चोट|एम्बुलेंस|तबीयत|दर्द|खतर",
+    "reminder": r"remind|alarm|pill|tablet|medic|forget|alert|appointment|"
+                r"गोली|दवा|याद|अलार्म",
+    "save_note": r"note|jot|write (?:this|that|it) down|keep this|store this|remember this|"
+                 r"लिख|सेव|नोट",
+    "read_notes": r"my notes|my saved|saved|remember|told you|asked you|"
+                  r"लिखवा|नोट|बातें",
+    "clear_notes": r"erase|forget|remove|wipe|delete|clear|मिटा|भूल|डिलीट",
+    "call": r"ring|phone|dial|call|फोन|कॉल",
+    "message": r"message|text|sms|tell my|let my|write to|मैसेज|बोलो|खबर",
+    "phone": r"navigate|direction|station|way home|route|song|music|cab|taxi|whatsapp|"
+             r"picture|photo|camera|rain|weather|स्टेशन|गान|बारिश|टैक्सी|जाऊं",
+}
+
+# a wrong local guess costs more for some intents than a Gemini round trip:
+# these act on the phone, call someone or read private notes aloud
+MIN_SCORE_OVERRIDES = {
+    "emergency": 0.6,
+    "phone": 0.6,
+    "call": 0.6,
+    "message": 0.6,
+    "read_notes": 0.6,
+    "save_note": 0.55,
+}
+
+
+def tokenize(text):
+    return TOKEN.findall(text.lower())
+
+
+def features(text):
+    """Words, word pairs and in-word character trigrams (for inflections and typos)"""
+    words = tokenize(text)
+    feats = list(words)
+    feats += [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        feats += [f"#{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return feats
+
+
+class IntentClassifier:
+    """
+    TF-IDF nearest neighbour over EXAMPLES, all on-device
+    classify(text) -> {"intent", "score", "example"} when the closest
+    example is at least min_score similar, beats the best other intent by
+    margin and the text has one of the intent's KEYWORDS, else None (ask
+    the LLM)
+    """
+
+    def __init__(self, examples=EXAMPLES, min_score=INTENT_MIN_SCORE, overrides=MIN_SCORE_OVERRIDES,
+                 keywords=KEYWORDS, margin=INTENT_MARGIN):
+        self.min_score = min_score
+        self.overrides = overrides
+        self.margin = margin
+        self.keywords = {
+            intent: re.compile(r"(?<![\wऀ-ॿ])(?:" + pattern + ")", re.IGNORECASE)
+            for intent, pattern in keywords.items()
+        }
+        self.labels = []
+        self.examples = []
+        docs = []
+        for intent, phrases in examples.items():
+            for phrase in phrases:
+                self.labels.append(intent)
+                self.examples.append(phrase)
+                docs.append(features(phrase))
+
+        self.vocab = {}
+        for doc in docs:
+            for feat in doc:
+                self.vocab.setdefault(feat, len(self.vocab))
+
+        df = np.zeros(len(self.vocab), dtype=np.float32)
+        for doc in docs:
+            for feat in set(doc):
+                df[self.vocab[feat]] += 1
+        # smoothed idf, as if there were one extra document containing everything
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+
+        self.matrix = np.stack([self._vector(doc) for doc in docs])
+
+    def _vector(self, feats):
+        vec = np.zeros(len(self.vocab), dtype=np.float32)
+        for feat in feats:
+            i = self.vocab.get(feat)
+            if i is not None:
+                vec[i] += 1
+        # sublinear tf: saying a word twice isn't twice the evidence
+        np.log1p(vec, out=vec)
+        vec *= self.idf
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+    def scores(self, text):
+        """Cosine similarity to every example"""
+        return self.matrix @ self._vector(features(text))
+
+    def classify(self, text):
+        sims = self.scores(text)
+        best = int(np.argmax(sims))
+        score = float(sims[best])
+        intent = self.labels[best]
+        if intent == "none" or score < self.overrides.get(intent, self.min_score):
+            return None
+        runner_up = max(
+            (float(sim) for sim, label in zip(sims, self.labels) if label != intent),
+            default=0.0
+        )
+        if score - runner_up < self.margin:
+            return None
+        keywords = self.keywords.get(intent)
+        if keywords is not None and not keywords.search(text):
+            return None
+        return {"intent": intent, "score": score, "example": self.examples[best]}
+
+
+if __name__ == "__main__":
+    # python intent_classifier.py: paraphrases it should catch, and general
+    # questions (none of them in EXAMPLES) that must go to the AI
+    import sys
+
+    classifier = IntentClassifier()
+    commands = [
+        ("I need my pills set for tonight", "reminder"),
+        ("could you jot down that the car is in lot B", "save_note"),
+        ("what did I ask you to remember", "read_notes"),
+        ("what's on my notes", "read_notes"),
+        ("please ring my sister", "call"),
+        ("let my dad know i reached home", "message"),
+        ("मुझे रात को गोली याद दिलाना", "reminder"),
+        ("गाना चलाओ", "phone"),
+        ("play some songs", "phone"),
+        ("get me a cab please", "phone"),
+        ("i fell down", "emergency"),
+        ("सब नोट्स मिटा दो", "clear_notes"),
+    ]
+    general = [
+        "what are black holes",
+        "what are my rights",
+        "tell me what happened in 1947",
+        "show me the way to be happy",
+        "write an email",
+        "wake me up inside lyrics",
+        "what is the capital of France",
+        "tell me a joke",
+        "who won the cricket match",
+        "how do i cook rice",
+        "how do i get better sleep",
+        "what did you say",
+        "my phone is not working",
+        "what are notes in music",
+        "what are my chances of rain",
+        "what are my strengths",
+        "show me the way to success",
+        "write a story for kids",
+        "tell me what you know about india",
+        "what did gandhi say about truth",
+        "what is the best phone to buy",
+        "can you play chess",
+        "मुझे एक कहानी सुनाओ",
+        "भारत की राजधानी क्या है",
+    ]
+
+    failed = 0
+    for text, expected in commands:
+        result = classifier.classify(text)
+        got = result and result["intent"]
+        if got != expected:
+            failed += 1
+            print(f"MISS {text!r}: got {got}, expected {expected}")
+    for text in general:
+        result = classifier.classify(text)
+        if result is not None:
+            failed += 1
+            print(f"FALSE MATCH {text!r}: {result}")
+    print(f"{len(commands) + len(general) - failed}/{len(commands) + len(general)} cases")
+
+    started = time.perf_counter()
+    for _ in range(1000):
+        classifier.classify(commands[0][0])
+    print(f"\n{(time.perf_counter() - started) * 1000:.0f} us per classification, "
+          f"{len(classifier.examples)} examples, {len(classifier.vocab)} features")
+
+    sys.exit(1 if failed else 0)
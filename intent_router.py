@@ -0,0 +1,212 @@
+import re
+import time
+
+# a match can't start or end inside a word; Devanagari vowel signs and
+# viramas aren't \w to Python's re, so the whole block counts as letters
+WORD_CHARS = r"\wऀ-ॿ"
+
+EMERGENCY_WORDS = ["emergency", "help", "sos", "bachao", "बचाओ", "मदद"]
+
+# checked in this order, the first one that applies wins; several entries
+# may share a name when their words need different rules
+#   phrases   - any of these (whole words) selects the intent
+#   requires  - and one of these must be said too
+#   max_words - only for short utterances ("stop" yes, "nearest bus stop" no)
+#   slot      - name of the slot filled from the router's slot values
+INTENTS = [
+    {
+        "name": "exit",
+        "phrases": ["bye", "goodbye", "exit", "quit", "बाय", "अलविदा"],
+    },
+    {
+        "name": "exit",
+        "phrases": ["stop"],
+        "max_words": 4,
+    },
+    {
+        "name": "emergency",
+        "phrases": EMERGENCY_WORDS,
+    },
+    {
+        "name": "reminder",
+        "phrases": ["remind", "reminder", "reminders", "medicine", "medicines", "दवा", "रिमाइंडर"],
+    },
+    {
+        "name": "save_note",
+        "phrases": ["remember", "note", "save", "याद", "नोट"],
+        "requires": ["this", "that", "यह", "वह"],
+    },
+    {
+        "name": "read_notes",
+        "phrases": ["read notes", "my notes", "नोट्स", "यादें"],
+    },
+    {
+        "name": "clear_notes",
+        "phrases": ["delete notes", "clear notes", "नोट्स डिलीट"],
+    },
+    {
+        "name": "call",
+        "phrases": ["call", "कॉल"],
+        "slot": "contact",
+    },
+    {
+        "name": "message",
+        "phrases": ["message", "text", "send", "मैसेज", "भेजो"],
+        "slot": "contact",
+    },
+    {
+        "name": "phone",
+        "phrases": [
+            "open", "search", "find", "navigate", "map", "whatsapp",
+            "photo", "launch", "खोलो", "ढूंढो", "take me", "nearest",
+            "hospital", "restaurant", "directions", "route", "location",
+            "weather", "play", "video", "music", "book", "order",
+            "मुझे ले जाओ", "सबसे नज़दीक", "अस्पताल", "दिशा"
+        ],
+    },
+]
+
+
+def trie_pattern(words):
+    """
+    One regex alternation for all words, factored as a prefix trie
+    ("call", "clear notes" -> "c(?:all|lear notes)") so matching at a
+    position costs the length of the longest word, not the number of words
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        # longest first: "notes" must be tried before "note"
+        branches = []
+        optional = False
+        for ch in sorted(node, reverse=True):
+            if ch == "":
+                optional = True
+            else:
+                branches.append(re.escape(ch) + build(node[ch]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if optional:
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class IntentRouter:
+    """
+    The INTENTS table compiled into a single regex
+    route(text) scans the text once and returns the best intent with its
+    slots, or None when nothing matches (the question goes to the AI).
+    """
+
+    def __init__(self, intents=INTENTS, slots=None):
+        # slots: {"contact": ["mom", "dad", ...]}
+        # entries are referred to by position, names can repeat
+        self.intents = list(intents)
+        self.slots = slots or {}
+
+        # every word -> what it means; one word can mean several things
+        self.roles = {}
+        for i, intent in enumerate(self.intents):
+            for phrase in intent["phrases"]:
+                self._add(phrase, ("phrase", i))
+            for word in intent.get("requires", []):
+                self._add(word, ("requires", i))
+        for slot, values in self.slots.items():
+            for value in values:
+                self._add(value, ("slot", slot, value))
+
+        self.pattern = re.compile(
+            f"(?<![{WORD_CHARS}])(?:{trie_pattern(self.roles)})(?![{WORD_CHARS}])",
+            re.IGNORECASE
+        )
+
+    def _add(self, word, role):
+        self.roles.setdefault(word.lower(), []).append(role)
+
+    def scan(self, text):
+        """Phrase hits per table entry, qualifier hits per entry and slot values found"""
+        phrases, requires, slots = set(), set(), {}
+        for match in self.pattern.finditer(text):
+            for role in self.roles.get(match.group(0).lower(), ()):
+                if role[0] == "phrase":
+                    phrases.add(role[1])
+                elif role[0] == "requires":
+                    requires.add(role[1])
+                else:
+                    # first mention wins
+                    slots.setdefault(role[1], role[2])
+        return phrases, requires, slots
+
+    def route(self, text):
+        """{"intent": name, "slots": {...}} for the first intent that applies, or None"""
+        phrases, requires, slots = self.scan(text)
+        if not phrases:
+            return None
+
+        # only the entries that were hit, in table order
+        for i in sorted(phrases):
+            intent = self.intents[i]
+            if "requires" in intent and i not in requires:
+                continue
+            if "max_words" in intent and len(text.split()) > intent["max_words"]:
+                continue
+
+            found = {}
+            if "slot" in intent:
+                found[intent["slot"]] = slots.get(intent["slot"])
+            return {"intent": intent["name"], "slots": found}
+        return None
+
+
+if __name__ == "__main__":
+    # micro-benchmark: python intent_router.py
+    contacts = {"contact": ["mom", "dad", "sister", "brother", "friend"]}
+    router = IntentRouter(slots=contacts)
+
+    samples = [
+        "call mom",
+        "Please send a message to my sister",
+        "remind me to take my medicine at 8",
+        "remember that the keys are in the drawer",
+        "where is the nearest bus stop",
+        "मम्मी को कॉल करो",
+        "मुझे अस्पताल ले जाओ",
+        "what is the capital of France",
+        "bye",
+        "stop",
+        "okay thank you so much goodbye",
+    ]
+    for text in samples:
+        print(f"{text!r:45} -> {router.route(text)}")
+
+    def old_chain(text, intents=INTENTS):
+        # the sequential substring checks this router replaced
+        for intent in intents:
+            if any(word in text for word in intent["phrases"]):
+                return intent["name"]
+        return None
+
+    def bench(fn, texts, rounds=2000):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for text in texts:
+                fn(text)
+        return (time.perf_counter() - started) / (rounds * len(texts)) * 1e6
+
+    print(f"\ntable router:   {bench(router.route, samples):.1f} us/utterance")
+    print(f"any() chain:    {bench(old_chain, samples):.1f} us/utterance")
+
+    # routing cost should stay flat as commands are added
+    for extra in (100, 1000, 10000):
+        big = INTENTS + [{"name": f"app_{i}", "phrases": [f"launch app number {i}"]} for i in range(extra)]
+        big_router = IntentRouter(big, contacts)
+        chain = bench(lambda text: old_chain(text, big), samples, 20)
+        print(f"+{extra:>5} phrases: router {bench(big_router.route, samples, 200):.1f} us, any() chain {chain:.1f} us")
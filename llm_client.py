@@ -0,0 +1,279 @@
+import os
+import time
+import queue
+import random
+import threading
+import collections
+
+AI_FAKE = os.getenv("AI_FAKE", "0") == "1"
+AI_FAKE_FIRST_TOKEN = float(os.getenv("AI_FAKE_FIRST_TOKEN", "0.4"))
+AI_FAKE_CHUNK_DELAY = float(os.getenv("AI_FAKE_CHUNK_DELAY", "0.15"))
+
+AI_DEADLINE = float(os.getenv("AI_DEADLINE", "6"))
+AI_STREAM_IDLE = float(os.getenv("AI_STREAM_IDLE", "4"))
+AI_RETRIES = int(os.getenv("AI_RETRIES", "2"))
+AI_HEDGE = os.getenv("AI_HEDGE", "1") == "1"
+AI_HEDGE_AFTER = float(os.getenv("AI_HEDGE_AFTER", "2.5"))
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModels:
+    """
+    Stands in for genai.Client().models, offline
+    Answers come from `answers` (question substring -> answer) or a canned
+    reply, and stream a few words at a time with Gemini-like pauses
+    """
+
+    def __init__(self, answers=None, first_token=AI_FAKE_FIRST_TOKEN,
+                 chunk_delay=AI_FAKE_CHUNK_DELAY, chunk_words=4):
+        self.answers = answers or {}
+        self.first_token = first_token
+        self.chunk_delay = chunk_delay
+        self.chunk_words = chunk_words
+        self.calls = 0
+
+    def _answer(self, contents):
+        for question, answer in self.answers.items():
+            if question.lower() in contents.lower():
+                return answer
+        return (
+            "This is an offline test answer. The real model is not being called. "
+            "Set AI_FAKE=0 to talk to Gemini."
+        )
+
+    def generate_content(self, model, contents, config=None):
+        self.calls += 1
+        answer = self._answer(contents)
+        time.sleep(self.first_token + self.chunk_delay * len(answer.split()) / self.chunk_words)
+        return FakeResponse(answer)
+
+    def generate_content_stream(self, model, contents, config=None):
+        self.calls += 1
+        words = self._answer(contents).split(" ")
+        time.sleep(self.first_token)
+        for i in range(0, len(words), self.chunk_words):
+            if i:
+                time.sleep(self.chunk_delay)
+            # chunks carry their own leading space, like the real stream
+            yield FakeResponse((" " if i else "") + " ".join(words[i:i + self.chunk_words]))
+
+
+class FakeClient:
+    """genai.Client look-alike for running and testing without the network"""
+
+    def __init__(self, answers=None, **kwargs):
+        self.models = FakeModels(answers, **kwargs)
+
+
+class DeadlineExceeded(Exception):
+    """No answer within the call's deadline"""
+
+
+class RetryBudget:
+    """
+    Retries may add at most `ratio` extra load on top of first attempts
+    Every request deposits `ratio` tokens, every retry spends one, so an
+    outage doesn't turn into a retry storm
+    """
+
+    def __init__(self, ratio=0.2, initial=3.0, cap=10.0):
+        self.ratio = ratio
+        self.tokens = initial
+        self.cap = cap
+        self.lock = threading.Lock()
+
+    def deposit(self):
+        with self.lock:
+            self.tokens = min(self.cap, self.tokens + self.ratio)
+
+    def withdraw(self):
+        with self.lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class ResilientLLM:
+    """
+    Deadlines, retries and hedging around one shared genai client
+    - deadline: seconds until the first text arrives (the whole answer for
+      generate), then stream_idle seconds between chunks; past it
+      DeadlineExceeded is raised so the caller can say something
+    - retries: failed attempts are retried with jittered exponential
+      backoff while the deadline and the retry budget allow
+    - hedging: an attempt slower than the recent p95 (hedge_after until
+      there is enough history) gets a second, parallel attempt; the first
+      to produce text wins and the other is dropped
+    The client and its HTTP connections are reused for every call.
+    """
+
+    def __init__(self, client, deadline=AI_DEADLINE, stream_idle=AI_STREAM_IDLE,
+                 retries=AI_RETRIES, hedge=AI_HEDGE, hedge_after=AI_HEDGE_AFTER,
+                 budget=None):
+        self.client = client
+        self.deadline = deadline
+        self.stream_idle = stream_idle
+        self.retries = retries
+        self.hedge = hedge
+        self.hedge_after = hedge_after
+        self.budget = budget or RetryBudget()
+        # seconds to first text of recent successful calls
+        self.latencies = collections.deque(maxlen=100)
+        self.lock = threading.Lock()
+        self.hedged = 0
+        self.retried = 0
+        self.timeouts = 0
+
+    def p95(self):
+        with self.lock:
+            if len(self.latencies) < 10:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[int(0.95 * (len(ordered) - 1))]
+
+    def _hedge_delay(self):
+        p95 = self.p95()
+        # a very fast history shouldn't hedge every call that takes 0.1s
+        return self.hedge_after if p95 is None else max(p95, 0.5)
+
+    def generate(self, model, contents, deadline=None):
+        """Full answer text"""
+        def call(emit, cancelled):
+            emit(self.client.models.generate_content(model=model, contents=contents).text or "")
+
+        return "".join(self._run(call, deadline))
+
+    def stream(self, model, contents, deadline=None):
+        """Answer text chunks as they arrive"""
+        def call(emit, cancelled):
+            for chunk in self.client.models.generate_content_stream(model=model, contents=contents):
+                if cancelled.is_set():
+                    # lost the hedge race or the caller gave up
+                    return
+                if chunk.text:
+                    emit(chunk.text)
+
+        return self._run(call, deadline)
+
+    def _run(self, call, deadline=None):
+        deadline_at = time.monotonic() + (self.deadline if deadline is None else deadline)
+        events = queue.Queue()
+        cancels = []
+        live = set()
+        started = {}
+
+        def launch():
+            attempt = len(cancels)
+            cancelled = threading.Event()
+            cancels.append(cancelled)
+            live.add(attempt)
+            started[attempt] = time.monotonic()
+
+            def work():
+                try:
+                    call(lambda text: events.put((attempt, "text", text)), cancelled)
+                    events.put((attempt, "done", None))
+                except Exception as e:
+                    events.put((attempt, "error", e))
+
+            threading.Thread(target=work, daemon=True).start()
+
+        def cancel_all():
+            for cancelled in cancels:
+                cancelled.set()
+
+        self.budget.deposit()
+        launch()
+        hedge_at = time.monotonic() + self._hedge_delay()
+        winner = None
+        retries = 0
+
+        try:
+            while True:
+                now = time.monotonic()
+                if winner is None:
+                    timeout = deadline_at - now
+                    if timeout <= 0:
+                        with self.lock:
+                            self.timeouts += 1
+                        raise DeadlineExceeded(f"no answer in {deadline_at - min(started.values()):.1f}s")
+                    can_hedge = self.hedge and len(cancels) == 1
+                    if can_hedge:
+                        timeout = min(timeout, max(0.0, hedge_at - now))
+                else:
+                    timeout = self.stream_idle
+
+                try:
+                    attempt, kind, value = events.get(timeout=timeout)
+                except queue.Empty:
+                    if winner is not None:
+                        raise DeadlineExceeded(f"stream stalled for {self.stream_idle:.1f}s")
+                    if self.hedge and len(cancels) == 1 and time.monotonic() >= hedge_at:
+                        print(f"[AI] Slow answer, sending a hedged request after {self._hedge_delay():.1f}s")
+                        with self.lock:
+                            self.hedged += 1
+                        launch()
+                    continue
+
+                if winner is not None and attempt != winner:
+                    continue
+
+                if kind == "error":
+                    live.discard(attempt)
+                    if winner is not None:
+                        # text was already handed out, can't start over
+                        raise value
+                    if live:
+                        # the hedge is still running
+                        continue
+                    backoff = min(2.0, 0.25 * 2 ** retries) * random.uniform(0.5, 1.5)
+                    if (retries < self.retries and time.monotonic() + backoff < deadline_at
+                            and self.budget.withdraw()):
+                        print(f"[AI Error]: {value}, retrying")
+                        retries += 1
+                        with self.lock:
+                            self.retried += 1
+                        time.sleep(backoff)
+                        launch()
+                        hedge_at = time.monotonic() + self._hedge_delay()
+                        continue
+                    raise value
+
+                if winner is None:
+                    winner = attempt
+                    with self.lock:
+                        self.latencies.append(time.monotonic() - started[attempt])
+                    for other, cancelled in enumerate(cancels):
+                        if other != attempt:
+                            cancelled.set()
+
+                if kind == "done":
+                    return
+                yield value
+        finally:
+            cancel_all()
+
+    def stats(self):
+        p95 = self.p95()
+        with self.lock:
+            return {
+                "calls": len(self.latencies),
+                "p95": p95,
+                "hedged": self.hedged,
+                "retried": self.retried,
+                "timeouts": self.timeouts
+            }
+
+
+def make_client(api_key, fake=AI_FAKE):
+    """genai.Client, or FakeClient with AI_FAKE=1"""
+    if fake:
+        print("[AI] Using the offline fake client")
+        return FakeClient()
+    from google import genai
+    return genai.Client(api_key=api_key)
@@ -0,0 +1,95 @@
+import gc
+import threading
+from concurrent.futures import Future
+from stt_engines import STT_ENGINE, STT_MODEL_SIZE, load_engine
+
+# Loaded STT engines shared by every BraillAI in this process
+# (engine name, model size) -> {"engine": STTEngine, "refs": int, "ready": Future}
+# engine is None while the model is still loading
+_models = {}
+_lock = threading.Lock()
+
+
+def _key(name, size):
+    return (name or STT_ENGINE, size or STT_MODEL_SIZE)
+
+
+def acquire(name=None, size=None, warm_up=True):
+    """
+    Get a loaded engine, loading it on first use
+    Every acquire() needs a matching release()
+    The load runs outside the lock: other models stay available meanwhile,
+    and callers wanting the same model wait for the one load
+    """
+    key = _key(name, size)
+    with _lock:
+        entry = _models.get(key)
+        loading = entry is None
+        if loading:
+            entry = _models[key] = {"engine": None, "refs": 0, "ready": Future()}
+        entry["refs"] += 1
+
+    if not loading:
+        engine = entry["ready"].result()
+        print(f"STT engine reused: {key[0]} ({key[1]})")
+        return engine
+
+    try:
+        engine = load_engine(*key)
+        if warm_up:
+            engine.warm_up()
+    except Exception as e:
+        with _lock:
+            _models.pop(key, None)
+        entry["ready"].set_exception(e)
+        raise
+
+    with _lock:
+        entry["engine"] = engine
+    entry["ready"].set_result(engine)
+    return engine
+
+
+def release(engine):
+    """Drop one reference, the model stays loaded until evict()"""
+    with _lock:
+        for entry in _models.values():
+            if entry["engine"] is engine:
+                entry["refs"] = max(0, entry["refs"] - 1)
+                return
+
+
+def evict(name=None, size=None, force=False):
+    """
+    Unload models nobody is using
+    With no name/size every idle model goes; force also drops models in use
+    Returns the keys that were unloaded
+    """
+    with _lock:
+        if name is None and size is None:
+            keys = list(_models)
+        else:
+            keys = [_key(name, size)]
+
+        evicted = []
+        engines = []
+        for key in keys:
+            entry = _models.get(key)
+            # still loading: its caller is about to use it
+            if entry and entry["engine"] is not None and (force or entry["refs"] == 0):
+                del _models[key]
+                evicted.append(key)
+                engines.append(entry["engine"])
+
+    # outside the lock, a batched engine waits for its queue to drain
+    for engine in engines:
+        engine.close()
+    if evicted:
+        gc.collect()
+    return evicted
+
+
+def loaded():
+    """{(engine, size): refcount} for everything currently in memory"""
+    with _lock:
+        return {key: entry["refs"] for key, entry in _models.items() if entry["engine"] is not None}
@@ -0,0 +1,86 @@
+# Fixed things Braill-AI says, pre-synthesized into the TTS cache at startup
+# Keep in sync with the speak() calls in braill_ai_v2.py (only the ones
+# without names/times/notes filled in)
+
+STATIC_PROMPTS = {
+    "en": [
+        # language selection
+        "Please say Hindi or English.",
+        "I didn't hear anything. Please try again.",
+        "You have selected English. You can now speak to me in English.",
+        "Defaulting to English.",
+        "Hello. I am Braill-AI, your personal assistant. I'm here to help you, just tell me what you need me to do.",
+
+        # emergency
+        "Emergency detected. Calling for help.",
+        "Phone not connected. Please call manually.",
+        "Calling now.",
+        "Having trouble calling.",
+
+        # reminders
+        "What medicine should I remind you about?",
+        "I didn't hear that.",
+        "What time? Say the hour like eight AM or two PM.",
+        "I didn't hear the time.",
+        "Couldn't understand the time. Please try again.",
+
+        # notes
+        "What would you like me to remember?",
+        "I didn't hear anything.",
+        "Got it! I'll remember that.",
+        "No notes found.",
+        "No notes to clear.",
+        "All notes deleted.",
+        "Okay, keeping your notes.",
+
+        # calls, messages, phone
+        "Phone not connected.",
+        "Couldn't make the call.",
+        "I didn't hear the message.",
+        "Message sent.",
+        "Couldn't send message.",
+        "Doing that on your phone.",
+        "Done!",
+        "Had trouble doing that.",
+
+        # misc
+        "I'm not sure about that. Try asking something else.",
+        "Stopping now.",
+        "Goodbye! Take care.",
+    ],
+    "hi": [
+        "आपने हिंदी चुनी है। अब आप मुझसे हिंदी में बात कर सकते हैं।",
+        "नमस्ते। मैं Braill-AI हूँ। मैं आपकी मदद के लिए हूं।",
+
+        "आपातकाल! सहायता के लिए कॉल किया जा रहा है।",
+        "फोन कनेक्ट नहीं है। कृपया मैन्युअल रूप से कॉल करें।",
+        "कॉल की जा रही है।",
+        "कॉल करने में समस्या है।",
+
+        "कौन सी दवा के लिए रिमाइंडर सेट करना है?",
+        "मुझे सुनाई नहीं दिया।",
+        "कितने बजे? जैसे आठ बजे सुबह या दो बजे शाम।",
+        "समय सुनाई नहीं दिया।",
+        "समय समझ नहीं आया। कृपया फिर से कोशिश करें।",
+
+        "क्या याद रखना है?",
+        "कुछ सुनाई नहीं दिया।",
+        "याद रख लिया।",
+        "कोई नोट नहीं है।",
+        "सभी नोट्स डिलीट हो गए।",
+        "ठीक है, नोट्स रखे जा रहे हैं।",
+
+        "फोन कनेक्ट नहीं है।",
+        "कॉल नहीं हो पाई।",
+        "मैसेज सुनाई नहीं दिया।",
+        "मैसेज भेज दिया गया।",
+        "मैसेज नहीं भेजा जा सका।",
+        "फोन पर कर रहा हूं।",
+        "हो गया।",
+        "समस्या आई।",
+
+        "मुझे समझ नहीं आया। कुछ और पूछिए।",
+        "रुक रहा हूँ।",
+        "अलविदा! ध्यान रखिए।",
+    ],
+}
@@ -0,0 +1,154 @@
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+import collections
+
+AI_CACHE_FILE = os.getenv("AI_CACHE_FILE", "ai_cache.json")
+AI_CACHE_TTL_HOURS = float(os.getenv("AI_CACHE_TTL_HOURS", "168"))
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "500"))
+
+# first match wins: (pattern, ttl in seconds); 0 = never cache, None = default ttl
+# answers to these change by the day (or minute), a stale one is worse than a slow one
+CACHE_RULES = [
+    (r"\b(today|tonight|tomorrow|yesterday|now|right now|current|currently|latest|recent|news)\b", 0),
+    (r"\b(time|date|day|month|year|weather|temperature|rain|score|price|stock)\b", 0),
+    (r"(?<![\wऀ-ॿ])(आज|कल|अभी|समय|तारीख|दिन|मौसम|खबर|बारिश|कीमत)(?![\wऀ-ॿ])", 0),
+    (r"\b(who is the|president|prime minister|ceo|champion)\b", 24 * 3600),
+]
+
+# politeness and hesitation only; pronouns and verbs change the question
+# ("tell me about you" vs "tell me about me")
+FILLERS = {
+    "please", "kindly", "hey", "hi", "ok", "okay", "um", "uh", "umm", "hmm",
+    "braill", "ज़रा", "जरा", "कृपया",
+}
+
+# maths between digits is part of the question: 6+2 and 6-2 must not share an answer
+OPERATOR = re.compile(r"(?<=\d)\s*([+\-*/%=])\s*(?=\d)")
+PUNCTUATION = re.compile(r"(?!(?<=\d)[+\-*/%=.](?=\d))[^\w\sऀ-ॿ]")
+
+
+def normalize(question):
+    """Lowercase, no punctuation or filler words: "Hey, what's 2 + 2 please?" == "what s 2+2\""""
+    words = PUNCTUATION.sub(" ", OPERATOR.sub(r"\1", question.lower())).split()
+    kept = [word for word in words if word not in FILLERS]
+    return " ".join(kept or words)
+
+
+class ResponseCache:
+    """
+    ask_ai answers keyed by (normalized question, language, prompt template, model)
+    Entries expire after their ttl; past max_entries the least recently used
+    go. The whole cache is a small JSON file, rewritten on every put, so
+    answers survive restarts. Questions matching a `rules` entry with ttl 0
+    (time, weather, news...) are never cached.
+    """
+
+    def __init__(
+        self,
+        path=AI_CACHE_FILE,
+        ttl=AI_CACHE_TTL_HOURS * 3600,
+        max_entries=AI_CACHE_MAX_ENTRIES,
+        rules=CACHE_RULES
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.rules = [(re.compile(pattern, re.IGNORECASE), rule_ttl) for pattern, rule_ttl in rules]
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+
+        # key -> {"question", "answer", "expires"}, least recently used first
+        self.entries = collections.OrderedDict()
+        self._load()
+
+    @staticmethod
+    def key(question, language, template, model):
+        raw = f"{model}\0{language}\0{template}\0{normalize(question)}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def ttl_for(self, question):
+        """Seconds an answer may be reused; 0 means don't cache it"""
+        for pattern, rule_ttl in self.rules:
+            if pattern.search(question):
+                return self.ttl if rule_ttl is None else rule_ttl
+        return self.ttl
+
+    def get(self, question, language, template, model):
+        """Cached answer, or None"""
+        if self.ttl_for(question) <= 0:
+            with self.lock:
+                self.skipped += 1
+            return None
+
+        key = self.key(question, language, template, model)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry["expires"] < time.time():
+                if entry is not None:
+                    del self.entries[key]
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry["answer"]
+
+    def put(self, question, language, template, model, answer):
+        ttl = self.ttl_for(question)
+        if ttl <= 0 or not answer:
+            return
+
+        key = self.key(question, language, template, model)
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = {
+                "question": question,
+                "answer": answer,
+                "expires": time.time() + ttl
+            }
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._save()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[AI Cache Error]: {e}")
+            return
+
+        now = time.time()
+        # saved in LRU order, keep it
+        for key, entry in saved.items():
+            if entry.get("expires", 0) > now:
+                self.entries[key] = entry
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[AI Cache Error]: {e}")
@@ -0,0 +1,75 @@
+import threading
+from response_cache import normalize
+
+
+def word_distance(a, b):
+    """Word-level edit distance between two normalized questions"""
+    a, b = normalize(a).split(), normalize(b).split()
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y)))
+        previous = current
+    return previous[-1]
+
+
+class Speculation:
+    """
+    An answer started from a partial transcript, before the user finished
+    `answer` is an iterator of sentences (ask_ai_stream); they are buffered
+    on a worker thread as they arrive. If the final transcript turns out to
+    be the same question, sentences() replays the buffer and then follows
+    the rest of the stream; otherwise cancel() drops it.
+    """
+
+    def __init__(self, question, answer):
+        self.question = question
+        self.answer = answer
+        self.buffer = []
+        self.finished = False
+        self.cancelled = threading.Event()
+        self.cond = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        try:
+            for sentence in self.answer:
+                if self.cancelled.is_set():
+                    break
+                with self.cond:
+                    self.buffer.append(sentence)
+                    self.cond.notify_all()
+        except Exception as e:
+            print(f"[Speculative AI Error]: {e}")
+        finally:
+            if self.cancelled.is_set():
+                # closes the LLM stream under it
+                self.answer.close()
+            with self.cond:
+                self.finished = True
+                self.cond.notify_all()
+
+    def matches(self, text):
+        """
+        Same question? Normalized words must agree, allowing one word of
+        ASR wobble per 8 words; an added "and germany" is a new question
+        """
+        words = len(normalize(text).split())
+        return word_distance(self.question, text) <= words // 8
+
+    def cancel(self):
+        self.cancelled.set()
+        with self.cond:
+            self.cond.notify_all()
+
+    def sentences(self):
+        i = 0
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: i < len(self.buffer) or self.finished or self.cancelled.is_set())
+                if i >= len(self.buffer):
+                    return
+                sentence = self.buffer[i]
+            i += 1
+            yield sentence
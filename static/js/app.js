@@ -769,6 +769,15 @@ socket.on('assistant_started', (data) => {
     document.body.classList.add('assistant-active');
 });
 
+socket.on('assistant_ready', (data) => {
+    addSystemMessage(data.message);
+});
+
+socket.on('partial_transcript', (data) => {
+    const indicator = document.getElementById('listening-indicator');
+    indicator.innerHTML = `<span class="pulse"></span> ${escapeHtml(data.text)}…`;
+});
+
 socket.on('assistant_stopped', (data) => {
     isAssistantRunning = false;
     updateStatus('Stopped', false);
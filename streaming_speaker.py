@@ -0,0 +1,120 @@
+import re
+import queue
+import threading
+
+# sentence ends in English and Hindi (danda), followed by whitespace
+SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+
+
+def split_sentences(text, min_chars=12):
+    """
+    Split text into speakable chunks at sentence boundaries
+    Fragments shorter than min_chars ("Dr.", "Yes.") are merged forward
+    """
+    chunks = []
+    pending = ""
+    for part in SENTENCE_END.split(text.strip()):
+        pending = f"{pending} {part}".strip() if pending else part.strip()
+        if len(pending) >= min_chars:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        if chunks and len(pending) < min_chars:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+
+def stream_sentences(chunks, min_chars=12):
+    """
+    Sentences from text that arrives in pieces (an LLM stream)
+    Each sentence is yielded as soon as the one after it has started, so
+    speech can begin while the rest is still being generated
+    """
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        parts = SENTENCE_END.split(pending)
+        # the last part may still be growing
+        pending = parts.pop()
+        ready = ""
+        for part in parts:
+            ready = f"{ready} {part}".strip() if ready else part.strip()
+            if len(ready) >= min_chars:
+                yield ready
+                ready = ""
+        if ready:
+            pending = f"{ready} {pending}"
+    if pending.strip():
+        yield from split_sentences(pending, min_chars)
+
+
+_DONE = object()
+
+
+class StreamingSpeaker:
+    """
+    Plays sentence N while a worker synthesizes sentence N+1
+    synthesize(text) -> audio and play(audio) (blocking) are supplied by
+    the assistant; play returning False (barge-in) drops the remaining
+    sentences. Sentences can come from any iterable, including a
+    generator that is still producing them.
+    """
+
+    def __init__(self, synthesize, play, lookahead=2):
+        self.synthesize = synthesize
+        self.play = play
+        self.lookahead = lookahead
+
+    def speak(self, text):
+        self.speak_iter(split_sentences(text))
+
+    def speak_iter(self, sentences):
+        """Speak every sentence; returns the ones that were actually played"""
+        ready = queue.Queue(maxsize=self.lookahead)
+        cancelled = threading.Event()
+
+        def offer(item):
+            # a full queue must not pin the worker once playback gave up
+            while not cancelled.is_set():
+                try:
+                    ready.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
+        def produce():
+            try:
+                for sentence in sentences:
+                    if cancelled.is_set():
+                        break
+                    try:
+                        audio = self.synthesize(sentence)
+                    except Exception as e:
+                        print(f"[TTS Error]: {e}")
+                        continue
+                    offer((sentence, audio))
+            except Exception as e:
+                # the sentence source itself failed (e.g. a dropped LLM stream)
+                print(f"[TTS Error]: {e}")
+            finally:
+                offer(_DONE)
+
+        threading.Thread(target=produce, daemon=True).start()
+
+        spoken = []
+        try:
+            while True:
+                item = ready.get()
+                if item is _DONE:
+                    break
+                sentence, audio = item
+                finished = self.play(audio)
+                spoken.append(sentence)
+                if finished is False:
+                    break
+        finally:
+            # the worker notices on its own, don't wait for a synthesis in flight
+            cancelled.set()
+        return spoken
@@ -0,0 +1,131 @@
+import threading
+
+
+def common_prefix(a, b):
+    """Longest run of words two hypotheses agree on"""
+    words = []
+    for x, y in zip(a.split(), b.split()):
+        if x != y:
+            break
+        words.append(x)
+    return " ".join(words)
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription while an utterance is still being recorded
+    Every step_ms of new audio the utterance so far (at most the last
+    window_seconds of it) is decoded again, so consecutive decodes overlap.
+    The part of the hypothesis two decodes in a row agree on is reported
+    as stable.
+    When the utterance ends, the last decode often already covers all of
+    it; final_result() hands that back so the caller can skip decoding
+    the same audio again.
+
+    on_partial(text, stable) is called from the worker thread.
+    """
+
+    def __init__(
+        self,
+        engine,
+        mic,
+        language=None,
+        step_ms=800,
+        window_seconds=8.0,
+        prepare=None,
+        on_partial=None
+    ):
+        self.engine = engine
+        self.mic = mic
+        self.language = language
+        self.step = mic.ms_to_samples(step_ms)
+        self.window = int(window_seconds * mic.sample_rate)
+        self.prepare = prepare
+        self.on_partial = on_partial
+
+        self.start_pos = None
+        self.end_pos = None
+        self.text = ""
+        self.stable = ""
+        # engine result of the last decode and the [start, end) it was given
+        self.result = None
+        self.decoded = None
+        self.done = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def update(self, start, end):
+        """Utterance now spans [start, end) in the mic's ring"""
+        with self.cond:
+            self.start_pos = start
+            self.end_pos = end
+            self.cond.notify()
+
+    def finish(self):
+        """Stop decoding; waits for a decode in flight so the engine is free"""
+        with self.cond:
+            self.done = True
+            self.cond.notify()
+        self.thread.join()
+        return self.stable
+
+    def final_result(self):
+        """
+        The last decode's engine result if it covered the whole utterance as
+        of the last update(), else None. Call after finish().
+        Audio after the last decode counts as covered if prepare() finds
+        nothing in it (the silence kept as a tail for the decoder).
+        """
+        if self.result is None or self.decoded is None or self.start_pos is None:
+            return None
+        first, last = self.decoded
+        if first > self.start_pos:
+            return None
+        if last < self.end_pos:
+            if self.prepare is None or self.prepare(self.mic.read(last, self.end_pos)).size:
+                return None
+        return self.result
+
+    def _ready(self, decoded_end):
+        if self.done:
+            return True
+        if self.start_pos is None:
+            return False
+        return self.end_pos - max(decoded_end, self.start_pos) >= self.step
+
+    def _loop(self):
+        decoded_end = 0
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: self._ready(decoded_end))
+                if self.done:
+                    return
+                start, end = self.start_pos, self.end_pos
+
+            first = max(start, end - self.window)
+            audio = self.mic.read(first, end)
+            if self.prepare:
+                audio = self.prepare(audio)
+            if audio.size == 0:
+                decoded_end = end
+                continue
+
+            try:
+                result = self.engine.transcribe(audio, language=self.language)
+            except Exception as e:
+                print(f"[Streaming STT Error]: {e}")
+                return
+            decoded_end = end
+            self.result = result
+            self.decoded = (first, end)
+
+            text = result["text"].strip().lower()
+            self.stable = common_prefix(self.text, text) if self.text else ""
+            self.text = text
+
+            if self.on_partial and text:
+                try:
+                    self.on_partial(text, self.stable)
+                except Exception as e:
+                    print(f"[Partial Callback Error]: {e}")
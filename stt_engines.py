@@ -0,0 +1,173 @@
+import os
+import time
+import numpy as np
+import whisper
+from inference_service import BatchedWhisperService
+
+SAMPLE_RATE = 16000
+
+# Engine selection, see ENGINES below
+STT_ENGINE = os.getenv("STT_ENGINE", "whisper")
+STT_MODEL_SIZE = os.getenv("STT_MODEL_SIZE", "base")
+STT_THREADS = int(os.getenv("STT_THREADS", "0"))
+
+
+class STTEngine:
+    """
+    Speech to text engine interface
+    transcribe() takes 16 kHz float32 mono audio and returns a dict:
+        text        - the transcript
+        confidence  - 0..1, from the decoder's average log probability
+        timings     - seconds spent decoding, audio length, real-time factor
+    """
+
+    name = "base"
+
+    def __init__(self, size=STT_MODEL_SIZE):
+        self.size = size
+        self.load_seconds = 0.0
+
+    def transcribe(self, audio, language=None):
+        raise NotImplementedError
+
+    def close(self):
+        """Stop anything that would keep the model alive after eviction"""
+
+    def warm_up(self):
+        """One throwaway decode so the first real call skips first-call costs"""
+        started = time.perf_counter()
+        noise = (np.random.default_rng(0).standard_normal(SAMPLE_RATE) * 0.01).astype(np.float32)
+        self.transcribe(noise, language="en")
+        print(f"STT warm-up done in {time.perf_counter() - started:.1f}s")
+
+    def _result(self, text, avg_logprob, started, audio):
+        elapsed = time.perf_counter() - started
+        audio_seconds = len(audio) / SAMPLE_RATE
+        return {
+            "text": text.strip(),
+            "confidence": float(np.exp(avg_logprob)) if avg_logprob is not None else 0.0,
+            "timings": {
+                "transcribe": elapsed,
+                "audio": audio_seconds,
+                "rtf": elapsed / audio_seconds if audio_seconds else 0.0
+            }
+        }
+
+
+class WhisperEngine(STTEngine):
+    """openai-whisper, fp32 on CPU"""
+
+    name = "whisper"
+
+    def __init__(self, size=STT_MODEL_SIZE):
+        super().__init__(size)
+        started = time.perf_counter()
+        self.model = whisper.load_model(size)
+        self.load_seconds = time.perf_counter() - started
+
+    def transcribe(self, audio, language=None):
+        started = time.perf_counter()
+        result = self.model.transcribe(
+            audio,
+            fp16=False,
+            language=language,
+            temperature=0.0
+        )
+
+        segments = result.get("segments") or []
+        avg_logprob = (
+            float(np.mean([seg["avg_logprob"] for seg in segments]))
+            if segments else None
+        )
+        return self._result(result["text"], avg_logprob, started, audio)
+
+
+class BatchedWhisperEngine(WhisperEngine):
+    """
+    openai-whisper behind a BatchedWhisperService
+    Sessions sharing this engine (see model_registry) are decoded together
+    """
+
+    name = "whisper-batched"
+
+    def __init__(self, size=STT_MODEL_SIZE):
+        super().__init__(size)
+        self.service = BatchedWhisperService(self.model)
+
+    def transcribe(self, audio, language=None):
+        # too long for one batch window, decode it on its own
+        if len(audio) > whisper.audio.N_SAMPLES:
+            return super().transcribe(audio, language=language)
+
+        started = time.perf_counter()
+        decoded, batch_size = self.service.submit(audio, language).result()
+        result = self._result(decoded.text, decoded.avg_logprob, started, audio)
+        result["timings"]["batch"] = batch_size
+        return result
+
+    def close(self):
+        self.service.close()
+
+
+class FasterWhisperEngine(STTEngine):
+    """
+    CTranslate2 Whisper with int8 weights on CPU
+    Needs the optional faster-whisper package
+    """
+
+    name = "faster-whisper"
+
+    def __init__(self, size=STT_MODEL_SIZE, compute_type="int8"):
+        super().__init__(size)
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise RuntimeError("faster-whisper engine needs: pip install faster-whisper")
+
+        started = time.perf_counter()
+        self.model = WhisperModel(
+            size,
+            device="cpu",
+            compute_type=compute_type,
+            cpu_threads=STT_THREADS
+        )
+        self.load_seconds = time.perf_counter() - started
+
+    def transcribe(self, audio, language=None):
+        started = time.perf_counter()
+        segments, info = self.model.transcribe(
+            audio,
+            language=language,
+            beam_size=1,
+            temperature=0.0,
+            condition_on_previous_text=False
+        )
+
+        # segments is a generator, decoding happens while we iterate
+        segments = list(segments)
+        text = " ".join(seg.text.strip() for seg in segments)
+        avg_logprob = (
+            float(np.mean([seg.avg_logprob for seg in segments]))
+            if segments else None
+        )
+        return self._result(text, avg_logprob, started, audio)
+
+
+ENGINES = {
+    WhisperEngine.name: WhisperEngine,
+    BatchedWhisperEngine.name: BatchedWhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+}
+
+
+def load_engine(name=None, size=None):
+    """Build the configured engine, e.g. load_engine("faster-whisper", "small")"""
+    name = name or STT_ENGINE
+    size = size or STT_MODEL_SIZE
+
+    if name not in ENGINES:
+        raise ValueError(f"Unknown STT engine '{name}', pick one of: {', '.join(ENGINES)}")
+
+    engine = ENGINES[name](size)
+    print(f"STT engine ready: {name} ({size}) in {engine.load_seconds:.1f}s")
+    return engine
@@ -0,0 +1,385 @@
+import re
+import time
+import random
+import datetime
+
+# English and Hindi time expressions for reminders:
+#   "8:30 tonight", "at 7 pm", "quarter to nine", "in two hours", "every day at 9"
+#   "साढ़े आठ बजे", "शाम 5 बजे", "कल सुबह सवा सात बजे", "दो घंटे बाद", "रोज़ रात 9 बजे"
+# Everything is compiled once at import; parse() is a handful of regex searches.
+
+# Hindi boundaries: vowel signs aren't \w to Python's re
+B = r"(?<![\wऀ-ॿ])"
+E = r"(?![\wऀ-ॿ])"
+
+EN_UNITS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18,
+    "nineteen": 19,
+}
+EN_TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50}
+
+# written without nukta, the text is normalized the same way
+HI_NUMBERS = {
+    "एक": 1, "दो": 2, "तीन": 3, "चार": 4, "पांच": 5, "पाँच": 5, "छह": 6, "छः": 6,
+    "छे": 6, "सात": 7, "आठ": 8, "नौ": 9, "दस": 10, "ग्यारह": 11, "बारह": 12,
+    "पंद्रह": 15, "पन्द्रह": 15, "बीस": 20, "पच्चीस": 25, "तीस": 30, "पैंतीस": 35,
+    "चालीस": 40, "पैंतालीस": 45, "पचास": 50, "पचपन": 55,
+}
+
+DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+EN_NUMBER = re.compile(
+    r"\b(" + "|".join(EN_TENS) + r")(?:[\s-](" + "|".join(k for k in EN_UNITS if EN_UNITS[k] < 10) + r"))?\b"
+    r"|\b(" + "|".join(sorted(EN_UNITS, key=len, reverse=True)) + r")\b"
+)
+HI_NUMBER = re.compile(B + "(" + "|".join(sorted(HI_NUMBERS, key=len, reverse=True)) + ")" + E)
+MERIDIEM = re.compile(r"(?<![a-z])([ap])\.?\s?m\b\.?")
+OCLOCK = re.compile(r"\bo'?\s?clock\b")
+
+# relative: "in 2 hours", "in an hour and a half", "after 20 minutes", "दो घंटे में", "आधे घंटे बाद"
+EN_RELATIVE = re.compile(
+    r"\b(?:in|after)\s+(?P<n>\d+|an?|half an)\s+(?P<unit>minutes?|mins?|hours?|hrs?)"
+    r"(?P<half>\s+and\s+a\s+half)?\b"
+)
+HI_RELATIVE = re.compile(
+    B + r"(?P<n>\d+|आधे|आधा|डेढ|ढाई)\s*(?P<unit>घंटे|घंटा|घंटों|मिनट)\s*(?:में|बाद)" + E
+)
+
+# "साढ़े आठ बजे", "सवा 7 बजे", "पौने नौ बजे", "डेढ़ बजे", "8 बजकर 20 मिनट"
+HI_CLOCK = re.compile(
+    B + r"(?:(?P<mod>साढे|सवा|पौने)\s*)?(?P<hour>\d{1,2}|डेढ|ढाई)\s*"
+    r"(?:बजकर\s*(?P<minute>\d{1,2})\s*मिनट|बजे|बज)" + E
+)
+# "8:30", "8.30 pm", "8 30 pm", "7 pm", "9 o'clock"
+EN_CLOCK = re.compile(
+    r"\b(?P<hour>\d{1,2})[:.](?P<minute>\d{2})\s*(?P<ampm>am|pm)?\b"
+    r"|\b(?P<hour2>\d{1,2})(?:\s(?P<minute2>\d{2}))?\s*(?P<ampm2>am|pm|oclock)\b"
+)
+# ASR glues times together: "830 pm"
+EN_GLUED = re.compile(r"\b(?P<digits>\d{3,4})\s*(?P<ampm>am|pm)?\b")
+EN_PAST = re.compile(r"\b(?P<part>half|quarter|\d{1,2})\s+(?P<dir>past|to)\s+(?P<hour>\d{1,2})\b")
+EN_AT = re.compile(r"\bat\s+(?P<hour>\d{1,2})(?:\s(?P<minute>\d{2}))?\b")
+EN_NAMED = re.compile(r"\b(?P<name>noon|midday|midnight)\b")
+HI_NAMED = re.compile(B + r"(?P<name>आधी रात)" + E)
+AT_END = re.compile(r"\b(?:at|by|around|on)\s*$")
+FILLER = re.compile(r"\b(?:in the|at|the)\s*(?=\s|$)")
+BARE = re.compile(r"(?<![\d:])(?P<hour>\d{1,2})(?:[\s:.](?P<minute>\d{2}))?(?![\d:])")
+
+PERIODS = [
+    (re.compile(r"\b(morning)\b|" + B + "(सुबह|सवेरे)" + E), "morning"),
+    (re.compile(r"\b(afternoon)\b|" + B + "(दोपहर)" + E), "afternoon"),
+    (re.compile(r"\b(evening)\b|" + B + "(शाम)" + E), "evening"),
+    (re.compile(r"\b(tonight|night)\b|" + B + "(रात)" + E), "night"),
+]
+DAYS = [
+    (re.compile(r"\bday after tomorrow\b|" + B + "परसों" + E), 2),
+    (re.compile(r"\btomorrow\b|" + B + "कल" + E), 1),
+    (re.compile(r"\b(today|tonight)\b|" + B + "आज" + E), 0),
+]
+REPEAT = re.compile(
+    r"\b(every\s?day|daily|each day|every (?:morning|afternoon|evening|night))\b"
+    r"|" + B + r"(रोज|रोजाना|हर\s*(?:दिन|रोज)|प्रतिदिन)" + E
+)
+
+
+def normalize(text):
+    """Lowercase, ASCII digits for every number word, no nukta, am/pm spelled one way"""
+    text = text.lower().translate(DEVANAGARI_DIGITS).replace("़", "")
+    text = OCLOCK.sub(" oclock", text)
+    text = MERIDIEM.sub(lambda m: m.group(1) + "m", text)
+    text = EN_NUMBER.sub(_en_number, text)
+    text = HI_NUMBER.sub(lambda m: str(HI_NUMBERS[m.group(1)]), text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _en_number(m):
+    if m.group(3):
+        return str(EN_UNITS[m.group(3)])
+    return str(EN_TENS[m.group(1)] + (EN_UNITS[m.group(2)] if m.group(2) else 0))
+
+
+def _to_24h(hour, minute, ampm, period):
+    """Apply am/pm or a part of the day; None if the hour can't be a clock hour"""
+    if hour > 23 or minute > 59:
+        return None
+    if ampm == "pm" and hour < 12:
+        hour += 12
+    elif ampm == "am" and hour == 12:
+        hour = 0
+    elif not ampm and hour <= 12:
+        if period == "morning" and hour == 12:
+            hour = 0
+        elif period == "afternoon" and hour < 12:
+            hour += 12
+        elif period == "evening" and hour < 12:
+            hour += 12
+        elif period == "night":
+            # "night 11" is 23:00, "रात 2 बजे" is 2 at night
+            if hour == 12:
+                hour = 0
+            elif hour >= 6:
+                hour += 12
+    return hour, minute
+
+
+def _clock(text, bare_numbers):
+    """(hour, minute, ampm, span) from the first clock expression found, or None"""
+    m = HI_CLOCK.search(text)
+    if m:
+        raw = m.group("hour")
+        hour, minute = {"डेढ": (1, 30), "ढाई": (2, 30)}.get(raw, (None, 0))
+        if hour is None:
+            hour = int(raw)
+            minute = int(m.group("minute") or 0)
+            mod = m.group("mod")
+            if mod == "साढे":
+                minute = 30
+            elif mod == "सवा":
+                minute = 15
+            elif mod == "पौने":
+                hour, minute = (hour - 1) % 12 or 12, 45
+        return hour, minute, None, m.span()
+
+    m = EN_CLOCK.search(text)
+    if m:
+        if m.group("hour"):
+            return int(m.group("hour")), int(m.group("minute")), m.group("ampm"), m.span()
+        ampm = m.group("ampm2")
+        return int(m.group("hour2")), int(m.group("minute2") or 0), None if ampm == "oclock" else ampm, m.span()
+
+    m = EN_PAST.search(text)
+    if m:
+        part = {"half": 30, "quarter": 15}.get(m.group("part")) or int(m.group("part"))
+        hour = int(m.group("hour"))
+        if m.group("dir") == "past":
+            return hour, part, None, m.span()
+        return (hour - 1) % 12 or 12, 60 - part, None, m.span()
+
+    m = EN_GLUED.search(text)
+    if m and (m.group("ampm") or bare_numbers):
+        digits = m.group("digits")
+        return int(digits[:-2]), int(digits[-2:]), m.group("ampm"), m.span()
+
+    m = EN_AT.search(text)
+    if m:
+        return int(m.group("hour")), int(m.group("minute") or 0), None, m.span()
+
+    m = EN_NAMED.search(text) or HI_NAMED.search(text)
+    if m:
+        return (0 if m.group("name") in ("midnight", "आधी रात") else 12), 0, "named", m.span()
+
+    if bare_numbers:
+        m = BARE.search(text)
+        if m:
+            return int(m.group("hour")), int(m.group("minute") or 0), None, m.span()
+    return None
+
+
+def _relative(text):
+    """(timedelta, span) for "in 2 hours" style expressions, or None"""
+    m = EN_RELATIVE.search(text)
+    if m:
+        n = m.group("n")
+        amount = {"a": 1, "an": 1, "half an": 0.5}.get(n) or int(n)
+        if m.group("half"):
+            amount += 0.5
+    else:
+        m = HI_RELATIVE.search(text)
+        if not m:
+            return None
+        n = m.group("n")
+        amount = {"आधे": 0.5, "आधा": 0.5, "डेढ": 1.5, "ढाई": 2.5}.get(n) or int(n)
+
+    unit = m.group("unit")
+    minutes = amount if unit.startswith(("min", "मिनट")) else amount * 60
+    return datetime.timedelta(minutes=minutes), m.span()
+
+
+def parse(text, now=None, bare_numbers=False):
+    """
+    Time of a reminder from free text, or None
+    Returns {"hour", "minute", "date", "repeat", "span"}:
+      date   - datetime.date for a one-off ("tomorrow", "tonight", "in 2 hours"),
+               None when no day was given
+      repeat - "daily" when the user said so ("every day", "रोज़")
+      span   - (start, end) of the time expression in normalize(text)
+    bare_numbers lets a lone "8" count as a time, for answers to "What time?"
+    """
+    now = now or datetime.datetime.now()
+    text = normalize(text)
+    repeat = "daily" if REPEAT.search(text) else None
+
+    relative = _relative(text)
+    if relative:
+        delta, span = relative
+        at = now + delta
+        return {
+            "hour": at.hour,
+            "minute": at.minute,
+            "date": None if repeat else at.date(),
+            "repeat": repeat,
+            "span": span
+        }
+
+    clock = _clock(text, bare_numbers)
+    if clock is None:
+        return None
+    hour, minute, ampm, span = clock
+
+    period = None
+    for pattern, name in PERIODS:
+        if pattern.search(text):
+            period = name
+            break
+
+    day = None
+    if not repeat:
+        for pattern, offset in DAYS:
+            if pattern.search(text):
+                day = offset
+                break
+
+    if ampm == "named":
+        ampm, period = None, None
+    resolved = _to_24h(hour, minute, ampm, period)
+    if resolved is None:
+        return None
+    hour, minute = resolved
+
+    if not ampm and not period and hour < 12:
+        if day == 0:
+            # today: the next time the clock shows it
+            if (hour, minute) <= (now.hour, now.minute):
+                hour += 12
+        elif 1 <= hour <= 7:
+            # medicine at "2" is 2 in the afternoon
+            hour += 12
+
+    if day == 0 and period == "night" and hour < 6:
+        # "1 tonight" is after midnight, tomorrow's date
+        day = 1
+
+    date = None
+    if day is not None:
+        date = (now + datetime.timedelta(days=day)).date()
+        if (date, hour, minute) < (now.date(), now.hour, now.minute):
+            # already past, the reminder would never fire
+            date += datetime.timedelta(days=1)
+
+    return {"hour": hour, "minute": minute, "date": date, "repeat": repeat, "span": span}
+
+
+def strip_time(text, result):
+    """
+    normalize(text) without the time expression and its day, part of day
+    and repeat words, to find what the reminder is for
+    """
+    text = normalize(text)
+    start, end = result["span"]
+    text = AT_END.sub("", text[:start]) + " " + text[end:]
+    for pattern, _ in PERIODS + DAYS:
+        text = pattern.sub(" ", text)
+    text = FILLER.sub(" ", REPEAT.sub(" ", text))
+    return re.sub(r"\s+", " ", text).strip()
+
+
+if __name__ == "__main__":
+    # python time_parser.py: known cases, a fuzz run and timing; exits 1 on any failure
+    import sys
+
+    now = datetime.datetime(2026, 10, 18, 15, 0)
+    today = now.date()
+    tomorrow = today + datetime.timedelta(days=1)
+
+    cases = [
+        ("8:30 tonight", (20, 30, today, None)),
+        ("at 7 pm", (19, 0, None, None)),
+        ("eight thirty pm", (20, 30, None, None)),
+        ("830 p.m.", (20, 30, None, None)),
+        ("7 a.m. tomorrow", (7, 0, tomorrow, None)),
+        ("quarter to nine in the morning", (8, 45, None, None)),
+        ("half past six in the evening", (18, 30, None, None)),
+        ("every day at 9", (9, 0, None, "daily")),
+        ("every night at 10", (22, 0, None, "daily")),
+        ("in two hours", (17, 0, today, None)),
+        ("in an hour and a half", (16, 30, today, None)),
+        ("after 20 minutes", (15, 20, today, None)),
+        ("at noon", (12, 0, None, None)),
+        ("remind me at 2 to take aspirin", (14, 0, None, None)),
+        ("साढ़े आठ बजे", (8, 30, None, None)),
+        ("रात साढ़े आठ बजे", (20, 30, None, None)),
+        ("शाम 5 बजे", (17, 0, None, None)),
+        ("कल सुबह सवा सात बजे", (7, 15, tomorrow, None)),
+        ("पौने नौ बजे रात", (20, 45, None, None)),
+        ("दोपहर डेढ़ बजे", (13, 30, None, None)),
+        ("रात 2 बजे", (2, 0, None, None)),
+        ("दो घंटे बाद", (17, 0, today, None)),
+        ("आधे घंटे में", (15, 30, today, None)),
+        ("रोज़ रात ९ बजे", (21, 0, None, "daily")),
+        ("8 बजकर 20 मिनट", (8, 20, None, None)),
+        ("आज 4 बजे", (16, 0, today, None)),
+        ("at 12 tonight", (0, 0, tomorrow, None)),
+        ("at 1 tonight", (1, 0, tomorrow, None)),
+        ("आज रात 2 बजे", (2, 0, tomorrow, None)),
+        ("today at 2 pm", (14, 0, tomorrow, None)),
+        ("at 11 tonight", (23, 0, today, None)),
+    ]
+    failed = 0
+    for text, expected in cases:
+        result = parse(text, now)
+        got = result and (result["hour"], result["minute"], result["date"], result["repeat"])
+        if got != expected:
+            failed += 1
+            print(f"FAIL {text!r}: got {got}, expected {expected}")
+    print(f"{len(cases) - failed}/{len(cases)} known cases")
+
+    for text in ("take 2 tablets", "what medicine", "बचाओ", "", "remind me"):
+        if parse(text, now) is not None:
+            failed += 1
+            print(f"FAIL {text!r}: expected no time, got {parse(text, now)}")
+
+    # fuzz: generated times must round-trip, junk must never raise
+    rng = random.Random(0)
+    en_words = {v: k for k, v in EN_UNITS.items()}
+    mismatches = 0
+    for _ in range(2000):
+        hour12 = rng.randint(1, 12)
+        minute = rng.choice([0, 5, 15, 20, 30, 45])
+        pm = rng.random() < 0.5
+        hour = hour12 % 12 + (12 if pm else 0)
+        spoken_hour = en_words[hour12] if rng.random() < 0.5 else str(hour12)
+        form = rng.randint(0, 2)
+        if form == 0:
+            text = f"at {hour12}:{minute:02d} {'pm' if pm else 'am'}"
+        elif form == 1:
+            text = f"{spoken_hour} {'p.m.' if pm else 'a.m.'}"
+            minute = 0
+        else:
+            period = "रात" if pm and hour12 >= 6 else ("शाम" if pm else "सुबह")
+            if pm and hour12 < 6:
+                period = "दोपहर"
+            if hour12 == 12:
+                period, hour = "दोपहर", 12
+            text = f"{period} {hour12} बजकर {minute} मिनट"
+        result = parse(text, now)
+        if result is None or (result["hour"], result["minute"]) != (hour, minute):
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"FUZZ {text!r}: {result}")
+    print(f"fuzz: {2000 - mismatches}/2000 generated times round-tripped")
+
+    alphabet = "abcdefghijklmnopqrstuvwxyz 0123456789:.अआकखगबजेरातसुहशमघंटिमनटोडढ़"
+    for _ in range(5000):
+        parse("".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))), now, bare_numbers=True)
+    print("fuzz: 5000 random strings parsed without errors")
+
+    texts = [text for text, _ in cases]
+    started = time.perf_counter()
+    for _ in range(200):
+        for text in texts:
+            parse(text, now)
+    print(f"{(time.perf_counter() - started) / (200 * len(texts)) * 1e6:.0f} us per parse")
+
+    sys.exit(1 if failed or mismatches else 0)
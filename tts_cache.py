@@ -0,0 +1,160 @@
+import os
+import time
+import hashlib
+import threading
+import collections
+
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")
+TTS_CACHE_MAX_MB = float(os.getenv("TTS_CACHE_MAX_MB", "50"))
+TTS_CACHE_MEMORY_MB = float(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+
+
+class TTSCache:
+    """
+    Synthesized speech keyed by (text, language, voice)
+    Every clip is written to disk (encoded) so prompts survive restarts and
+    play when the network is down; once the folder passes max_bytes the
+    least recently used files are deleted.
+    Recently used clips also stay in memory, already run through `decode`
+    (e.g. to PCM) so a repeat skips both the disk and the decoder.
+    """
+
+    def __init__(
+        self,
+        directory=TTS_CACHE_DIR,
+        max_bytes=int(TTS_CACHE_MAX_MB * 1024 * 1024),
+        memory_bytes=int(TTS_CACHE_MEMORY_MB * 1024 * 1024),
+        decode=None
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.memory_bytes = memory_bytes
+        self.decode = decode
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        # key -> decoded clip, most recently used last
+        self.memory = collections.OrderedDict()
+        self.memory_used = 0
+
+        # key -> file size, oldest access first (mtime is bumped on every hit)
+        os.makedirs(directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(directory):
+            if name.endswith(".audio"):
+                path = os.path.join(directory, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name[:-len(".audio")], stat.st_size))
+        self.disk = collections.OrderedDict(
+            (key, size) for _, key, size in sorted(entries)
+        )
+        self.disk_bytes = sum(self.disk.values())
+
+    @staticmethod
+    def key(text, language, voice):
+        raw = f"{voice}\0{language}\0{text.strip()}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _path(self, key):
+        # mp3 or wav depending on the voice, the decoder sniffs the format
+        return os.path.join(self.directory, key + ".audio")
+
+    @staticmethod
+    def _size(clip):
+        return getattr(clip, "nbytes", None) or len(clip)
+
+    def _remember(self, key, data):
+        clip = self.decode(data) if self.decode else data
+        if key in self.memory:
+            self.memory_used -= self._size(self.memory.pop(key))
+        self.memory[key] = clip
+        self.memory_used += self._size(clip)
+        while self.memory_used > self.memory_bytes and len(self.memory) > 1:
+            _, old = self.memory.popitem(last=False)
+            self.memory_used -= self._size(old)
+        return clip
+
+    def get(self, text, language, voice="gtts"):
+        """Decoded clip, or None if this has never been synthesized"""
+        key = self.key(text, language, voice)
+        with self.lock:
+            clip = self.memory.get(key)
+            if clip is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return clip
+
+            if key not in self.disk:
+                self.misses += 1
+                return None
+
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                os.utime(path)
+            except OSError:
+                self.disk_bytes -= self.disk.pop(key)
+                self.misses += 1
+                return None
+
+            self.disk.move_to_end(key)
+            self.hits += 1
+            return self._remember(key, data)
+
+    def put(self, text, language, voice, data, remember=True):
+        """Store encoded audio; returns the decoded clip if remember is set"""
+        key = self.key(text, language, voice)
+        path = self._path(key)
+        tmp = path + ".tmp"
+
+        with self.lock:
+            clip = self._remember(key, data) if remember else None
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"[TTS Cache Error]: {e}")
+                return clip
+
+            self.disk_bytes += len(data) - self.disk.pop(key, 0)
+            self.disk[key] = len(data)
+            self._evict()
+            return clip
+
+    def _evict(self):
+        while self.disk_bytes > self.max_bytes and len(self.disk) > 1:
+            key, size = self.disk.popitem(last=False)
+            self.disk_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get_or_synthesize(self, text, language, voice, synthesize):
+        """Cached clip, calling synthesize(text, language) -> bytes on a miss"""
+        clip = self.get(text, language, voice)
+        if clip is None:
+            clip = self.put(text, language, voice, synthesize(text, language))
+        return clip
+
+    def prewarm(self, prompts, voice, synthesize):
+        """Synthesize every {language: [text]} prompt that isn't on disk yet"""
+        started = time.perf_counter()
+        made = 0
+        for language, texts in prompts.items():
+            for text in texts:
+                if self.key(text, language, voice) in self.disk:
+                    continue
+                try:
+                    # disk only, decoding every prompt now would just fill memory
+                    self.put(text, language, voice, synthesize(text, language), remember=False)
+                    made += 1
+                except Exception as e:
+                    # probably offline, the rest would fail too
+                    print(f"[TTS Cache Error]: prewarm stopped: {e}")
+                    return made
+        print(f"TTS cache warm: {made} new prompts in {time.perf_counter() - started:.1f}s")
+        return made
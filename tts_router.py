@@ -0,0 +1,180 @@
+import io
+import os
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+from gtts import gTTS
+
+TTS_TIMEOUT = float(os.getenv("TTS_TIMEOUT", "4"))
+TTS_SLOW_SECONDS = float(os.getenv("TTS_SLOW_SECONDS", "2.5"))
+TTS_BREAKER_FAILURES = int(os.getenv("TTS_BREAKER_FAILURES", "3"))
+TTS_BREAKER_COOLDOWN = float(os.getenv("TTS_BREAKER_COOLDOWN", "30"))
+TTS_SHORT_CHARS = int(os.getenv("TTS_SHORT_CHARS", "40"))
+
+
+class CircuitBreaker:
+    """
+    closed    - calls go through
+    open      - `failures` bad calls in a row; calls are refused for `cooldown` seconds
+    half-open - cooldown over; one probe call is let through, its result
+                closes or re-opens the breaker
+    """
+
+    def __init__(self, failures=TTS_BREAKER_FAILURES, cooldown=TTS_BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self.state = "closed"
+        self.bad_calls = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown:
+                self.state = "half-open"
+                return True
+            # open, or half-open with a probe already in flight
+            return False
+
+    def record_success(self):
+        with self.lock:
+            if self.state != "closed":
+                print("[TTS] Online voice recovered")
+            self.state = "closed"
+            self.bad_calls = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.bad_calls += 1
+            if self.state == "half-open" or self.bad_calls >= self.failures:
+                if self.state != "open":
+                    print(f"[TTS] Online voice degraded, using offline voice for {self.cooldown:.0f}s")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+
+class GTTSEngine:
+    """Google TTS over the network, mp3 bytes"""
+
+    name = "gtts"
+
+    def synthesize(self, text, lang):
+        buf = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=False, timeout=TTS_TIMEOUT).write_to_fp(buf)
+        return buf.getvalue()
+
+
+class LocalEngine:
+    """
+    Offline TTS, wav bytes
+    espeak-ng/espeak writes straight to stdout; pyttsx3 is the fallback
+    and can only render to a file
+    """
+
+    name = "local"
+
+    def __init__(self):
+        self.espeak = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.pyttsx3 = None
+        # pyttsx3 engines are not thread safe
+        self.lock = threading.Lock()
+
+    def synthesize(self, text, lang):
+        if self.espeak:
+            return subprocess.run(
+                [self.espeak, "-v", lang, "--stdout", text],
+                check=True,
+                capture_output=True,
+                timeout=10
+            ).stdout
+        return self._pyttsx3(text)
+
+    def _pyttsx3(self, text):
+        with self.lock:
+            if self.pyttsx3 is None:
+                import pyttsx3
+                self.pyttsx3 = pyttsx3.init()
+
+            fd, path = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            try:
+                self.pyttsx3.save_to_file(text, path)
+                self.pyttsx3.runAndWait()
+                with open(path, "rb") as f:
+                    return f.read()
+            finally:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class TTSRouter:
+    """
+    Picks the online or offline voice per utterance
+    Online is preferred while it's healthy. Errors and calls slower than
+    slow_seconds trip the circuit breaker, after which the offline voice
+    is used until a probe succeeds. Short utterances go to whichever
+    engine has been faster lately.
+    """
+
+    def __init__(self, online=None, local=None, breaker=None,
+                 slow_seconds=TTS_SLOW_SECONDS, short_chars=TTS_SHORT_CHARS):
+        self.online = online or GTTSEngine()
+        self.local = local or LocalEngine()
+        self.breaker = breaker or CircuitBreaker()
+        self.slow_seconds = slow_seconds
+        self.short_chars = short_chars
+        # moving averages of synthesis time, None until first measured
+        self.latency = {self.online.name: None, self.local.name: None}
+
+    def online_healthy(self):
+        return self.breaker.state == "closed"
+
+    def _track(self, engine, seconds):
+        previous = self.latency[engine.name]
+        self.latency[engine.name] = seconds if previous is None else 0.8 * previous + 0.2 * seconds
+
+    def _timed(self, engine, text, lang):
+        started = time.perf_counter()
+        data = engine.synthesize(text, lang)
+        elapsed = time.perf_counter() - started
+        self._track(engine, elapsed)
+        return data, elapsed
+
+    def _prefer_local(self, text):
+        if len(text) > self.short_chars:
+            return False
+        online, local = self.latency[self.online.name], self.latency[self.local.name]
+        return online is not None and local is not None and local < online
+
+    def synthesize(self, text, lang):
+        """Returns (audio bytes, engine name); raises only if both engines fail"""
+        tried_online = False
+        if not self._prefer_local(text) and self.breaker.allow():
+            tried_online = True
+            try:
+                data, elapsed = self._timed(self.online, text, lang)
+                if elapsed > self.slow_seconds:
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                return data, self.online.name
+            except Exception as e:
+                print(f"[TTS Error]: online voice failed: {e}")
+                self.breaker.record_failure()
+
+        try:
+            data, _ = self._timed(self.local, text, lang)
+            return data, self.local.name
+        except Exception as e:
+            if tried_online:
+                raise
+            # last resort, never drop speech just because the breaker is open
+            print(f"[TTS Error]: offline voice failed: {e}")
+            data, _ = self._timed(self.online, text, lang)
+            return data, self.online.name
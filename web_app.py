@@ -140,6 +140,19 @@ def get_notes():
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/unload-models', methods=['POST'])
+def unload_models():
+    """Free speech models that no running assistant is using"""
+    try:
+        import model_registry
+        evicted = model_registry.evict()
+        print(f"Unloaded {len(evicted)} speech model(s)")
+        return jsonify({'success': True, 'unloaded': [f"{name} ({size})" for name, size in evicted]})
+    except Exception as e:
+        print(f"Error unloading models: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
 # webSoc
 @socketio.on('connect')
 def handle_connect():
@@ -179,7 +192,21 @@ def start_assistant(data):
         
         from braill_ai_v2 import BraillAI
         
+        # returns right away, Whisper keeps loading in the background
         braill_instance = BraillAI()
+
+        def on_ready(future):
+            if future.exception():
+                socketio.emit('error', {'message': f'Speech model failed to load: {future.exception()}'})
+            else:
+                socketio.emit('assistant_ready', {'message': 'Speech model loaded'})
+
+        braill_instance.ready.add_done_callback(on_ready)
+
+        # live partial transcripts for the dashboard
+        braill_instance.partial_listener = lambda text, stable: socketio.emit(
+            'partial_transcript', {'text': text, 'stable': stable}
+        )
         
         # Load contacts if they exist
         try:
@@ -214,6 +241,8 @@ def start_assistant(data):
                 socketio.emit('error', {'message': f'Assistant error: {str(e)}'})
             finally:
                 global is_running
+                # keeps the speech model cached for the next start
+                braill_instance.close()
                 is_running = False
                 socketio.emit('assistant_stopped', {})
         
@@ -269,6 +298,8 @@ def handle_command(data):
             try:
                 #Pause main loop
                 braill_instance.command_mode = True
+                # a button press is a new turn, an old barge-in mustn't mute it
+                braill_instance.barged_in = False
                 print(f"[COMMAND MODE] Pausing main loop for: {command}")
                 
                 if command == 'emergency':
@@ -370,6 +401,7 @@ def handle_quick_action(data):
         def execute_action():
             try:
                 braill_instance.command_mode = True
+                braill_instance.barged_in = False
                 print(f"[COMMAND MODE] Executing quick action: {action} -> {contact}")
                 
                 if action == 'call':